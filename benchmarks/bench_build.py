@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""Build benchmarks for WingTip.
+
+Generates synthetic documentation projects (nested directories with
+_category.json groups, images, code blocks, math, tables and varied front
+matter), then times `wingtip` on each, end to end and per stage (from
+`--profile`), in three scenarios:
+
+- cold: empty output directory, fresh process
+- warm: rebuild into the same output with nothing changed
+- edit: rebuild after appending a paragraph to one page
+
+Every build runs in its own process against this checkout (not an installed
+wingtip). Results are written as JSON so runs of different revisions on the
+same machine can be compared:
+
+    python benchmarks/bench_build.py --sizes 100 1000 10000
+    python benchmarks/bench_build.py --sizes 1000 --compare benchmarks/results/old.json
+
+A project can also be generated on its own for manual profiling:
+
+    python benchmarks/bench_build.py --generate /tmp/big-docs --pages 5000
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = REPO_ROOT / "benchmarks" / "results"
+DEFAULT_SIZES = [100, 1000, 10000]
+SCENARIOS = ("cold", "warm", "edit")
+
+WORDS = (
+    "api build cache client config deploy endpoint error event field handler index "
+    "input layout module network option output page plugin query request response "
+    "route schema search server session source static stream token update user "
+    "value version widget worker render template theme token timeout retry batch"
+).split()
+CODE_SAMPLES = {
+    "python": "def handler(event, context):\n    items = [item for item in event['items'] if item]\n    return {'count': len(items)}",
+    "javascript": "export async function fetchPage(url) {\n  const response = await fetch(url);\n  return response.json();\n}",
+    "bash": "pip install wingtip\nwingtip --source ./docs-project --output ./build",
+    "json": '{\n  "name": "example",\n  "retries": 3,\n  "timeout": 30\n}',
+}
+MATH_SAMPLES = (
+    "The cost grows as \\(O(n \\log n)\\) with \\(n\\) pages.",
+    "\\[ \\sum_{i=1}^{n} i = \\frac{n(n+1)}{2} \\]",
+    "\\[ e^{i\\pi} + 1 = 0 \\]",
+)
+
+
+def _sentence(rng, words=12):
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def _paragraph(rng, sentences=4):
+    return " ".join(_sentence(rng, rng.randint(8, 16)) for _ in range(sentences))
+
+
+def _page_dir(index, depth, fanout):
+    """Directory parts for page index: depth cycles 0..depth, names follow
+    the index's digits in base fanout so siblings share groups."""
+    parts = []
+    level_depth = index % (depth + 1)
+    value = index // (depth + 1)
+    for level in range(level_depth):
+        parts.append(f"group-{value % fanout:02d}" if level == 0 else f"topic-{value % fanout}")
+        value //= fanout
+    return parts
+
+
+def _write_images(img_dir, count, rng):
+    from PIL import Image, ImageDraw
+
+    img_dir.mkdir(parents=True, exist_ok=True)
+    names = []
+    for i in range(count):
+        name = f"figure-{i:02d}.png" if i % 2 == 0 else f"photo-{i:02d}.jpg"
+        image = Image.new("RGB", (1600, 900), tuple(rng.randrange(256) for _ in range(3)))
+        draw = ImageDraw.Draw(image)
+        for _ in range(20):
+            box = sorted(rng.randrange(1600) for _ in range(2)), sorted(rng.randrange(900) for _ in range(2))
+            draw.rectangle([box[0][0], box[1][0], box[0][1], box[1][1]], fill=tuple(rng.randrange(256) for _ in range(3)))
+        image.save(img_dir / name)
+        names.append(name)
+    return names
+
+
+def _front_matter(rng, index, title):
+    front = {"title": title}
+    start = date(2023, 1, 1)
+    if index % 2 == 0:
+        front["description"] = _sentence(rng, 14)
+    if index % 3 == 0:
+        front["date"] = (start + timedelta(days=index % 700)).isoformat()
+    if index % 7 == 0:
+        front["lastmod"] = (start + timedelta(days=index % 700 + 30)).isoformat()
+    if index % 4 == 0:
+        front["keywords"] = rng.sample(WORDS, 3)
+    if index % 5 == 0:
+        front["category"] = rng.choice(["Guides", "Reference", "Tutorials"])
+    if index % 11 == 0:
+        front["version"] = rng.choice(["1.0", "2.0"])
+    if index % 6 == 0:
+        front["order"] = index % 10
+    if index % 13 == 0:
+        front["author"] = "Bench Author"
+    if index % 17 == 0:
+        front["og_title"] = f"{title} | Bench"
+    if index % 101 == 0:
+        front["noindex"] = True
+    lines = ["---"]
+    for key, value in front.items():
+        lines.append(f"{key}: {json.dumps(value)}")
+    lines.append("---")
+    return "\n".join(lines)
+
+
+def generate_project(root, pages, depth=3, fanout=8, images=20, seed=1, git=True):
+    """Write a synthetic WingTip project with `pages` Markdown pages under root."""
+    rng = random.Random(seed)
+    root = Path(root)
+    if root.exists():
+        shutil.rmtree(root)
+    docs = root / "docs"
+    docs.mkdir(parents=True)
+
+    (root / "config.json").write_text(json.dumps({
+        "project_name": "Bench Docs",
+        "base_url": "https://bench.example.com",
+        "description": "Synthetic project for WingTip benchmarks.",
+        "github": {"repo": "example/bench-docs", "branch": "main"},
+    }, indent=2), encoding="utf8")
+    (root / "README.md").write_text("# Bench Docs\n\n" + _paragraph(rng) + "\n", encoding="utf8")
+    image_names = _write_images(docs / "img", images, rng) if images else []
+
+    paths = []
+    for index in range(pages):
+        parts = _page_dir(index, depth, fanout)
+        paths.append(Path(*parts, f"page-{index:05d}.md") if parts else Path(f"page-{index:05d}.md"))
+
+    groups = sorted({path.parent for path in paths if path.parent != Path(".")})
+    for number, group in enumerate(groups):
+        meta = {"name": group.name.replace("-", " ").title(), "order": number % 10}
+        if number % 3 == 0:
+            meta["index"] = True
+            meta["description"] = _sentence(rng, 10)
+        (docs / group).mkdir(parents=True, exist_ok=True)
+        (docs / group / "_category.json").write_text(json.dumps(meta), encoding="utf8")
+
+    for index, path in enumerate(paths):
+        title = f"{rng.choice(WORDS).title()} {rng.choice(WORDS)} {index}"
+        body = [_front_matter(rng, index, title), "", f"# {title}", "", _paragraph(rng)]
+        for section in range(rng.randint(2, 5)):
+            body += ["", f"## {rng.choice(WORDS).title()} {section + 1}", "", _paragraph(rng, rng.randint(2, 6))]
+            if section == 0:
+                body += [""] + [f"- {_sentence(rng, 6)}" for _ in range(4)]
+        language = rng.choice(list(CODE_SAMPLES))
+        body += ["", f"```{language}", CODE_SAMPLES[language], "```"]
+        if index % 5 == 0:
+            body += ["", rng.choice(MATH_SAMPLES)]
+        if index % 4 == 0:
+            body += ["", "| Option | Default | Description |", "| --- | --- | --- |"]
+            body += [f"| `{rng.choice(WORDS)}` | `{rng.randint(1, 100)}` | {_sentence(rng, 6)} |" for _ in range(4)]
+        if index % 9 == 0:
+            body += ["", "> [!NOTE]", f"> {_sentence(rng)}"]
+        if image_names and index % 10 == 0:
+            image = rng.choice(image_names)
+            body += ["", f"![{rng.choice(WORDS)}]({os.path.relpath(docs / 'img' / image, docs / path.parent)})"]
+        for target in rng.sample(range(pages), min(3, pages)):
+            link = os.path.relpath(docs / paths[target], docs / path.parent).replace(os.sep, "/")
+            body.append(f"\nSee also [page {target}]({link}).")
+        (docs / path).parent.mkdir(parents=True, exist_ok=True)
+        (docs / path).write_text("\n".join(body) + "\n", encoding="utf8")
+
+    if git and shutil.which("git"):
+        env = dict(os.environ, GIT_AUTHOR_NAME="bench", GIT_AUTHOR_EMAIL="bench@example.com",
+                   GIT_COMMITTER_NAME="bench", GIT_COMMITTER_EMAIL="bench@example.com")
+        for command in (["init", "-q"], ["add", "-A"], ["commit", "-q", "-m", "Synthetic docs"]):
+            subprocess.run(["git", *command], cwd=root, env=env, check=True)
+    return paths
+
+
+def run_build(project, output, profile_path, jobs=1, log_path=None):
+    """Build project into output in a fresh process; return the timing record."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(REPO_ROOT), os.environ.get("PYTHONPATH")])))
+    command = [sys.executable, "-m", "wingtip.main", "--source", str(project), "--output", str(output),
+               "--jobs", str(jobs), "--profile", str(profile_path)]
+    started = time.perf_counter()
+    with open(log_path or os.devnull, "w", encoding="utf8") as log:
+        completed = subprocess.run(command, cwd=project, env=env, stdout=log, stderr=subprocess.STDOUT)
+    wall = time.perf_counter() - started
+    if completed.returncode != 0:
+        raise RuntimeError(f"wingtip exited with status {completed.returncode}; see {log_path}")
+    profile = json.loads(Path(profile_path).read_text(encoding="utf8"))
+    return {
+        "wall_seconds": round(wall, 3),
+        "build_seconds": profile["total_seconds"],
+        "peak_rss_mb": profile["peak_rss_mb"],
+        "pages_rendered": profile["pages_rendered"],
+        "pages_reused": profile["pages_reused"],
+        "stages": {stage["name"]: stage["seconds"] for stage in profile["stages"]},
+        "phases": profile["phases"],
+        "wingtip": profile["wingtip"],
+    }
+
+
+def _median_run(runs):
+    """The run with the median build time (its stages stay consistent)."""
+    ordered = sorted(runs, key=lambda run: run["build_seconds"])
+    chosen = dict(ordered[(len(ordered) - 1) // 2])
+    chosen["build_seconds_all"] = [run["build_seconds"] for run in runs]
+    chosen["wall_seconds_median"] = round(statistics.median(run["wall_seconds"] for run in runs), 3)
+    return chosen
+
+
+def benchmark_size(workdir, pages, args):
+    project = workdir / f"project-{pages}"
+    output = workdir / f"site-{pages}"
+    print(f"Generating {pages} pages...")
+    paths = generate_project(project, pages, depth=args.depth, fanout=args.fanout,
+                             images=args.images, seed=args.seed, git=not args.no_git)
+    edited = project / "docs" / paths[len(paths) // 2]
+
+    results = []
+    for scenario in SCENARIOS:
+        runs = []
+        for repeat in range(args.repeat):
+            if scenario == "cold":
+                shutil.rmtree(output, ignore_errors=True)
+                shutil.rmtree(project / "docs" / "site", ignore_errors=True)
+            elif scenario == "edit":
+                with open(edited, "a", encoding="utf8") as f:
+                    f.write(f"\nEdited for benchmark run {repeat}.\n")
+            log_path = workdir / f"build-{pages}-{scenario}-{repeat}.log"
+            runs.append(run_build(project, output, workdir / "profile.json", jobs=args.jobs, log_path=log_path))
+        result = {"pages": pages, "scenario": scenario, **_median_run(runs)}
+        results.append(result)
+        print(f"  {pages:>6} pages  {scenario:<5} {result['build_seconds']:8.2f}s build, "
+              f"{result['wall_seconds']:8.2f}s wall, peak {result['peak_rss_mb']} MB, "
+              f"{result['pages_rendered']} rendered")
+    return results
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline_path, report):
+    """Print build-time changes against an earlier results file."""
+    baseline = json.loads(Path(baseline_path).read_text(encoding="utf8"))
+    previous = {(result["pages"], result["scenario"]): result for result in baseline["results"]}
+    print(f"\nCompared with {baseline_path} ({baseline.get('revision') or baseline.get('wingtip')}):")
+    for result in report["results"]:
+        before = previous.get((result["pages"], result["scenario"]))
+        if not before:
+            continue
+        change = (result["build_seconds"] - before["build_seconds"]) / before["build_seconds"] * 100 if before["build_seconds"] else 0.0
+        print(f"  {result['pages']:>6} pages  {result['scenario']:<5} {before['build_seconds']:8.2f}s -> "
+              f"{result['build_seconds']:8.2f}s ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark WingTip builds on synthetic projects")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, metavar="N", help="page counts to benchmark (default: 100 1000 10000)")
+    parser.add_argument("--depth", type=int, default=3, help="maximum directory depth of generated pages (default: 3)")
+    parser.add_argument("--fanout", type=int, default=8, help="groups per directory level (default: 8)")
+    parser.add_argument("--images", type=int, default=20, help="number of shared images (default: 20)")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for generated content (default: 1)")
+    parser.add_argument("--no-git", action="store_true", help="do not commit generated projects to a git repository")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="wingtip --jobs value (default: 1)")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per scenario; the median is reported (default: 1)")
+    parser.add_argument("--results", metavar="FILE", help="results JSON path (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", metavar="FILE", help="print changes against an earlier results file")
+    parser.add_argument("--workdir", metavar="DIR", help="where projects and outputs are built (default: a temporary directory, removed afterwards)")
+    parser.add_argument("--generate", metavar="DIR", help="only generate a project of --pages pages in DIR")
+    parser.add_argument("--pages", type=int, default=1000, help="page count for --generate (default: 1000)")
+    args = parser.parse_args()
+
+    if args.generate:
+        generate_project(args.generate, args.pages, depth=args.depth, fanout=args.fanout,
+                         images=args.images, seed=args.seed, git=not args.no_git)
+        print(f"Generated {args.pages} pages in {args.generate}")
+        return
+
+    workdir = Path(args.workdir or tempfile.mkdtemp(prefix="wingtip-bench-")).resolve()
+    workdir.mkdir(parents=True, exist_ok=True)
+    try:
+        results = []
+        for pages in args.sizes:
+            results += benchmark_size(workdir, pages, args)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "version": 1,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "wingtip": results[0]["wingtip"] if results else None,
+        "revision": _git_revision(),
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpus": os.cpu_count(),
+        },
+        "settings": {key: getattr(args, key) for key in ("depth", "fanout", "images", "seed", "no_git", "jobs", "repeat")},
+        "results": results,
+    }
+    results_path = Path(args.results) if args.results else RESULTS_DIR / f"bench-{datetime.now():%Y%m%d-%H%M%S}.json"
+    results_path.parent.mkdir(parents=True, exist_ok=True)
+    results_path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf8")
+    print(f"Wrote benchmark results: {results_path}")
+
+    if args.compare:
+        compare(args.compare, report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+// Live-reload client, injected into pages only by the dev server
+// (wingtip --serve). It tells the server which page this tab shows and
+// receives {action: 'reload'} when that page was rebuilt, or
+// {action: 'css'} when only styles changed (theme.json, static CSS).
+(function () {
+  const SCROLL_KEY = 'wingtip-livereload-scroll';
+  const RECONNECT_MS = 1000;
+  const endpoint = (location.protocol === 'https:' ? 'wss://' : 'ws://') + location.host + '/_wingtip/livereload';
+
+  const saved = sessionStorage.getItem(SCROLL_KEY);
+  if (saved) {
+    sessionStorage.removeItem(SCROLL_KEY);
+    const [x, y] = saved.split(',').map(Number);
+    window.addEventListener('load', () => window.scrollTo(x, y));
+  }
+
+  function reload() {
+    sessionStorage.setItem(SCROLL_KEY, window.scrollX + ',' + window.scrollY);
+    location.reload();
+  }
+
+  // Swap the page's stylesheets and <style> blocks for the rebuilt ones,
+  // removing the old ones only after the new ones load (no flash).
+  function swapStyles() {
+    fetch(location.href, { cache: 'no-store' })
+      .then(response => response.text())
+      .then(html => {
+        const fresh = new DOMParser().parseFromString(html, 'text/html');
+        const selector = 'link[rel="stylesheet"], style';
+        const old = Array.from(document.head.querySelectorAll(selector));
+        const oldHrefs = new Set(old.filter(node => node.href).map(node => node.href));
+        const added = Array.from(fresh.head.querySelectorAll(selector)).map(node => {
+          const copy = document.importNode(node, true);
+          // Same URL (fingerprinting off): bypass the stylesheet cache
+          if (copy.href && oldHrefs.has(copy.href)) {
+            const url = new URL(copy.href);
+            url.searchParams.set('livereload', Date.now());
+            copy.href = url.href;
+          }
+          return copy;
+        });
+        const anchor = old.length ? old[old.length - 1].nextSibling : null;
+        const loads = [];
+        added.forEach(node => {
+          if (node.tagName === 'LINK') {
+            loads.push(new Promise(resolve => { node.onload = node.onerror = resolve; }));
+          }
+          document.head.insertBefore(node, anchor);
+        });
+        Promise.all(loads).then(() => old.forEach(node => node.remove()));
+      })
+      .catch(reload);
+  }
+
+  let connected = false;
+  function connect() {
+    const socket = new WebSocket(endpoint);
+    socket.onopen = () => {
+      // The server restarted while this tab was open: it may have rebuilt
+      if (connected) {
+        reload();
+        return;
+      }
+      connected = true;
+      socket.send(JSON.stringify({ path: location.pathname }));
+    };
+    socket.onmessage = (event) => {
+      const message = JSON.parse(event.data);
+      if (message.action === 'css') {
+        swapStyles();
+      } else if (message.action === 'reload') {
+        reload();
+      }
+    };
+    socket.onclose = () => setTimeout(connect, RECONNECT_MS);
+  }
+  connect();
+})();
@@ -6,13 +6,20 @@ import sys
 import json
 import gzip
 import pathlib
+import posixpath
 import hashlib
+import copy
+import fnmatch
 import argparse
+import contextlib
+import time
+from collections import Counter
 import markdown
 import shutil
 import html as html_module 
 from string import Template
 from bs4 import BeautifulSoup 
+from html.parser import HTMLParser
 from datetime import datetime, date, timezone
 from email.utils import format_datetime
 import yaml 
@@ -20,6 +27,90 @@ import subprocess
 from .latex_extension import LaTeXPreservationExtension
 
 _last_modified_cache = {}
+_git_dates = None  # path -> commit date, once load_git_last_modified() has run
+
+# Source-derived caches (parsed sources, file digests, per-file dates, search
+# text) survive between builds in one process, so the dev server's rebuilds
+# start warm. Their entries carry the file's stat stamp, read once per build.
+_FILE_STAMPS = {}
+_WARM_ROOT = None  # working directory the warm caches belong to
+_SOCIAL_CARD_KEY = None  # inputs of the social card last drawn in this process
+_last_modified_stamped = {}
+
+def _relpath(path, start=os.curdir):
+    """os.path.relpath, minus its abspath()/getcwd() calls when path lies
+    under start: per-page loops call this thousands of times a build."""
+    path, start = os.path.normpath(path), os.path.normpath(start)
+    if not os.path.isabs(path) and not os.path.isabs(start):
+        if start == os.curdir and path != os.pardir and not path.startswith(os.pardir + os.sep):
+            return path
+    if path.startswith(start + os.sep) and os.path.isabs(path) == os.path.isabs(start):
+        return path[len(start) + 1:]
+    return os.path.relpath(path, start)
+
+def _file_stamp(path):
+    """(mtime_ns, size) of path as of this build, or None when missing."""
+    if path not in _FILE_STAMPS:
+        try:
+            st = os.stat(path)
+            _FILE_STAMPS[path] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            _FILE_STAMPS[path] = None
+    return _FILE_STAMPS[path]
+
+GIT_DATES_CACHE_NAME = ".wingtip-lastmod.json"
+
+def _git(*args):
+    return subprocess.run(['git', *args], capture_output=True, text=True, check=True).stdout
+
+def load_git_last_modified(cache_dir=None):
+    """Fill the last-modified map for every Markdown file in one git walk.
+
+    One `git log --name-only` over the history replaces a `git log -1` per
+    file; the newest commit touching a path wins. Paths are relative to the
+    current directory. When cache_dir is given, the map is stored there keyed
+    by HEAD, so repeat builds of the same commit skip the history walk.
+    Outside a git checkout this does nothing and get_last_modified keeps its
+    per-file behaviour.
+    """
+    global _git_dates
+    try:
+        head = _git('rev-parse', 'HEAD').strip()
+        prefix = _git('rev-parse', '--show-prefix').strip()
+    except Exception:
+        return
+    cache_key = f"{head}:{prefix}"
+    cache_path = os.path.join(cache_dir, GIT_DATES_CACHE_NAME) if cache_dir else None
+
+    if cache_path and os.path.exists(cache_path):
+        try:
+            cached = json.loads(pathlib.Path(cache_path).read_text(encoding='utf8'))
+            if cached.get('key') == cache_key:
+                _git_dates = cached['dates']
+                return
+        except Exception:
+            pass
+
+    try:
+        out = _git('log', '--relative', '--name-only', '--no-renames', '-z',
+                   '--format=%x1e%cI', '--', '*.md')
+    except Exception:
+        return
+    dates = {}
+    # -z output: \x1e<date>\0\n<path>\0<path>\0... per commit, newest first.
+    for commit in out.split('\x1e')[1:]:
+        date_str, _, names = commit.partition('\0')
+        for name in names.lstrip('\n').split('\0'):
+            if name and name not in dates:
+                dates[name] = date_str.strip()
+    _git_dates = dates
+
+    if cache_path:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            pathlib.Path(cache_path).write_text(json.dumps({'key': cache_key, 'dates': dates}), encoding='utf8')
+        except OSError as e:
+            print(f"Warning: Could not write {cache_path}: {e}")
 
 def get_last_modified(filepath: str) -> str:
     """
@@ -30,19 +121,35 @@ def get_last_modified(filepath: str) -> str:
     if filepath in _last_modified_cache:
         return _last_modified_cache[filepath]
 
-    try:
-        result = subprocess.run(
-            ['git', 'log', '-1', '--format=%cI', filepath],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        out = result.stdout.strip()
+    if _git_dates is not None:
+        # The bulk map covers every committed Markdown file; a miss means
+        # uncommitted, so go straight to mtime without spawning git.
+        out = _git_dates.get(_relpath(filepath).replace(os.sep, '/'))
         if out:
             _last_modified_cache[filepath] = out
             return out
-    except Exception:
-        pass
+    else:
+        # Without the bulk map each file costs a git subprocess; an earlier
+        # build in this process already answered for an unchanged file.
+        stamp = _file_stamp(filepath)
+        stamped = _last_modified_stamped.get(filepath)
+        if stamped and stamped[0] == stamp:
+            _last_modified_cache[filepath] = stamped[1]
+            return stamped[1]
+        try:
+            result = subprocess.run(
+                ['git', 'log', '-1', '--format=%cI', filepath],
+                capture_output=True,
+                text=True,
+                check=True
+            )
+            out = result.stdout.strip()
+            if out:
+                _last_modified_cache[filepath] = out
+                _last_modified_stamped[filepath] = (stamp, out)
+                return out
+        except Exception:
+            pass
 
     try:
         mtime = os.path.getmtime(filepath)
@@ -50,6 +157,8 @@ def get_last_modified(filepath: str) -> str:
         if not dt.endswith('Z') and '+' not in dt:
             dt += '+00:00'
         _last_modified_cache[filepath] = dt
+        if _git_dates is None:
+            _last_modified_stamped[filepath] = (_file_stamp(filepath), dt)
         return dt
     except OSError:
         now = datetime.now().isoformat()
@@ -320,6 +429,7 @@ CONFIG["project"] = CONFIG["project_name"]
 THEME_CFG_PATH = pathlib.Path("theme.json")
 THEME_CONFIG = {}
 _PLUGINS = []  # populated at build time
+_PROFILE = None  # timings being recorded for --profile, else None
 if THEME_CFG_PATH.exists():
     try:
         THEME_CONFIG = json.loads(THEME_CFG_PATH.read_text())
@@ -438,7 +548,7 @@ def write_llms_txt(nav_pages):
     concat_docs_filename = CONFIG.get("concat_docs_filename", "llms-full.txt")
     lines.append(f"- [{CONFIG.get('project', 'Project')} Full Documentation]({concat_docs_filename})")
 
-    output_path = os.path.join(OUTPUT_DIR, "llms.txt")
+    output_path = _emit_artifact(os.path.join(OUTPUT_DIR, "llms.txt"))
     with open(output_path, "w", encoding="utf8") as f:
         f.write("\n".join(lines) + "\n")
     print(f"Generated llms.txt: {output_path}")
@@ -474,7 +584,7 @@ def write_skill_md(nav_pages):
         "",
     ]
 
-    output_path = os.path.join(OUTPUT_DIR, "skill.md")
+    output_path = _emit_artifact(os.path.join(OUTPUT_DIR, "skill.md"))
     with open(output_path, "w", encoding="utf8") as f:
         f.write("\n".join(lines))
     print(f"Generated skill.md: {output_path}")
@@ -484,6 +594,7 @@ def write_robots_txt():
         "User-agent: *",
         "Allow: /",
         "Disallow: /search_index.json",
+        f"Disallow: /{SEARCH_DIR}/",
         f"Allow: /{CONFIG.get('concat_docs_filename', 'llms-full.txt')}",
         "Allow: /llms.txt"
     ]
@@ -497,11 +608,11 @@ def write_robots_txt():
         # For local preview (base_url = '.') or missing base_url, use a root-relative path
         lines.append(f"Sitemap: /sitemap.xml")
 
-    with open(os.path.join(OUTPUT_DIR, "robots.txt"), "w", encoding="utf8") as f:
+    with open(_emit_artifact(os.path.join(OUTPUT_DIR, "robots.txt")), "w", encoding="utf8") as f:
         f.write("\n".join(lines) + "\n") # Add trailing newline
 
 def write_sitemap_xml(pages):
-    with open(os.path.join(OUTPUT_DIR, "sitemap.xml"), "w", encoding="utf8") as f:
+    with open(_emit_artifact(os.path.join(OUTPUT_DIR, "sitemap.xml")), "w", encoding="utf8") as f:
         f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
         f.write('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
         for path, md_path in pages:
@@ -555,15 +666,13 @@ def generate_rss_feed(pages, output_dir):
     for html_path, md_path in pages:
         if not os.path.exists(md_path):
             continue
-        with open(md_path, 'r', encoding='utf8') as f:
-            md_text = f.read()
-        front = parse_frontmatter(md_text)
+        doc = load_source(md_path)
+        front, md_text = doc['front'], doc['raw']
         # Skip noindex pages in feed
-        robots = front.get('robots', '')
-        if front.get('noindex') or (isinstance(robots, str) and 'noindex' in robots.lower()):
+        if doc['noindex']:
             continue
 
-        title = html_module.escape(str(front.get('title') or extract_title(md_text)))
+        title = html_module.escape(doc['title'])
         rel_path = html_path.replace(output_dir + '/', '').lstrip('/')
         link = f"{site_link}/{rel_path}" if site_link else rel_path
         description = html_module.escape(
@@ -583,9 +692,9 @@ def generate_rss_feed(pages, output_dir):
 
     # Sort by publication date descending
     items.sort(key=lambda x: x[0], reverse=True)
-    item_xml = '\n'.join(item[1] for item in items)
 
-    rss = f"""<?xml version="1.0" encoding="UTF-8"?>
+    with _streamed_output(_emit_artifact(output_path)) as write:
+        write(f"""<?xml version="1.0" encoding="UTF-8"?>
 <rss version="2.0">
   <channel>
     <title>{site_title}</title>
@@ -594,12 +703,14 @@ def generate_rss_feed(pages, output_dir):
     <language>{language}</language>
     <lastBuildDate>{build_date}</lastBuildDate>
     <generator>WingTip</generator>
-{item_xml}
-  </channel>
+""")
+        for _, item in items:
+            write(item + "\n")
+        if not items:
+            write("\n")
+        write("""  </channel>
 </rss>
-"""
-    with open(output_path, 'w', encoding='utf8') as f:
-        f.write(rss)
+""")
     print(f"Generated RSS feed: {output_path}")
 
 def get_theme_colors():
@@ -736,6 +847,158 @@ def _plugin_markdown_extensions(plugins):
             extensions.extend(exts)
     return extensions
 
+class _LinkRewriter(markdown.treeprocessors.Treeprocessor):
+    """Rewrite .md links to .html and apply external-link rules."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Load external link config
+        self.config = self.load_config()
+
+    def load_config(self):
+        """External link configuration, defaulting when no config.json exists.
+
+        Reads the already-parsed CONFIG rather than re-opening config.json
+        off disk -- the old version warned twice per build for every user
+        without a config file, which is the documented zero-config path.
+        """
+        defaults = {
+            'open_in_new_tab': True,
+            'exclude_domains': [],
+            'include_domains': [],
+            'exclude_paths': [],
+            'attributes': {
+                'rel': 'noopener noreferrer',
+                'class': 'external-link'
+            }
+        }
+        overrides = CONFIG.get('external_links')
+        if not isinstance(overrides, dict):
+            return defaults
+        merged = defaults.copy()
+        merged.update(overrides)
+        return merged
+
+    def is_external_link(self, href):
+        """Check if a URL is external (starts with http:// or https://)"""
+        return href and href.startswith(('http://', 'https://'))
+
+    def should_open_in_new_tab(self, href):
+        """Determine if a link should open in a new tab based on config rules"""
+        if not self.is_external_link(href):
+            return False
+
+        # Extract domain from href
+        from urllib.parse import urlparse
+        domain = urlparse(href).netloc
+
+        # Check exclude_domains
+        if any(domain.endswith(d) for d in self.config.get('exclude_domains', [])):
+            return False
+
+        # Check include_domains
+        if any(domain.endswith(d) for d in self.config.get('include_domains', [])):
+            return True
+
+        # Check exclude_paths
+        path = urlparse(href).path
+        if any(fnmatch.fnmatch(path, pattern) for pattern in self.config.get('exclude_paths', [])):
+            return False
+
+        # Use global setting
+        return self.config.get('open_in_new_tab', True)
+
+    def run(self, root):
+        for element in root.iter('a'):
+            href = element.get('href')
+            if not href:
+                continue
+
+            if self.is_external_link(href):
+                # Handle external link according to config
+                if self.should_open_in_new_tab(href):
+                    element.set('target', '_blank')
+                    # Add additional attributes from config
+                    for key, value in self.config.get('attributes', {}).items():
+                        element.set(key, value)
+            else:
+                # Handle internal link rewriting
+                if href.startswith(('#', '/')):
+                    continue
+
+                # Handle .md extension conversion (including fragment/query variants)
+                base, sep, rest = href.partition('.md')
+                if sep == '.md':
+                    suffix = rest
+                    if not suffix or suffix.startswith(('#', '?')):
+                        href = base + '.html' + suffix
+
+                # Handle docs/ prefix for local development vs GitHub Pages.
+                # Only strip it when the docs/-prefixed path is not itself
+                # a real page — a project may legitimately have a docs/
+                # directory inside its docs tree (URL space docs/...).
+                if href.startswith('docs/'):
+                    path_only = href.split('#')[0].split('?')[0]
+                    if path_only not in _all_page_urls():
+                        href = href[5:]  # Remove docs/ prefix
+
+                element.set('href', href)
+        return root
+
+class _LinkRewriterExtension(markdown.Extension):
+    def extendMarkdown(self, md):
+        md.treeprocessors.register(_LinkRewriter(md), 'link_rewriter', 7)
+
+_MARKDOWN_ENGINES = {}
+_MARKDOWN_ENGINES_KEY = None  # what the cached engines were built from
+
+def _refresh_markdown_engines():
+    """Drop the cached engines when what they were built from changed.
+
+    They are otherwise kept across the dev server's rebuilds. The page
+    engine captures the `external_links` config, and plugin extensions come
+    from modules loaded afresh each build, so either one forces a rebuild.
+    """
+    global _MARKDOWN_ENGINES_KEY
+    key = (repr(CONFIG.get('external_links')),
+           tuple(p for p in _PLUGINS if getattr(p, 'markdown_extensions', None)))
+    if key != _MARKDOWN_ENGINES_KEY:
+        _MARKDOWN_ENGINES.clear()
+        _MARKDOWN_ENGINES_KEY = key
+
+def _markdown_engine(kind):
+    """Cached markdown.Markdown instance for 'page' or 'search'.
+
+    Constructing a Markdown object builds the whole extension registry
+    (codehilite, toc, smarty, GFM, plugin extensions), so each kind is built
+    once -- once per worker process under --jobs, and again only when
+    _refresh_markdown_engines() drops it -- and callers reset() it between
+    documents. Page rendering and search-text extraction
+    use separate profiles: search text must not pick up codehilite markup,
+    smart quotes, or <br>s, which would change what users can match.
+    """
+    engine = _MARKDOWN_ENGINES.get(kind)
+    if engine is None:
+        if kind == 'page':
+            engine = markdown.Markdown(
+                extensions=[
+                    "codehilite",
+                    "nl2br",           # Newlines to <br>
+                    "sane_lists",     # Better list handling
+                    "smarty",         # Smart quotes, dashes, etc
+                    "attr_list",     # {: .class} style attributes
+                    "md_in_html",    # Markdown inside HTML
+                    "toc",           # [TOC] generation
+                    _LinkRewriterExtension(),
+                    "wingtip.latex_extension"
+                ] + _gfm_extensions() + _plugin_markdown_extensions(_PLUGINS),
+                output_format="html5"
+            )
+        else:
+            engine = markdown.Markdown(extensions=_gfm_extensions())
+        _MARKDOWN_ENGINES[kind] = engine
+    return engine
+
+
 def _build_csp(front_matter):
     """Build a Content-Security-Policy string from config and per-page frontmatter."""
     csp = front_matter.get('csp')
@@ -792,8 +1055,144 @@ def _build_csp(front_matter):
         "upgrade-insecure-requests;"
     )
 
+# Always precached, in this order: the service worker's offline fallback
+# and the app shell
+_SW_SHELL = ('offline.html', 'index.html', 'manifest.json')
+
+# Precached by default, in priority order: pages, fingerprinted assets,
+# the search index, and the PWA icons. Markdown siblings, llms*.txt, and
+# feeds are cached at runtime when first used instead, as are content
+# images and their responsive variants, which are never precached.
+_SW_DEFAULT_INCLUDE = ('*.html', 'static/*', 'search_index.json', 'search/*', 'favicon.png', 'icon-*.png')
+_SW_DEFAULT_MAX_SIZE = 10 * 1024 * 1024
+
+_SERVICE_WORKER_JS = """// Generated by WingTip. PRECACHE lists [path, content hash] pairs;
+// installing a new version fetches only the entries whose hash changed.
+const PRECACHE = 'wingtip-precache';
+const RUNTIME = 'wingtip-runtime';
+const REVISIONS = '__wingtip_revisions__';
+const PRECACHE_ENTRIES = __PRECACHE__;
+
+const scope = self.registration.scope;
+const precacheUrls = new Map(PRECACHE_ENTRIES.map(([path, hash]) => [new URL(path, scope).href, hash]));
+// Content-hashed names (static/js/search.7a471197.js, search shards)
+const FINGERPRINTED = /\\.[0-9a-f]{8,}\\.[a-z0-9]+$/;
+
+self.addEventListener('install', (event) => {
+  event.waitUntil((async () => {
+    const cache = await caches.open(PRECACHE);
+    const stored = await cache.match(REVISIONS);
+    const revisions = stored ? await stored.json() : {};
+    const stale = [...precacheUrls].filter(([url, hash]) => revisions[url] !== hash);
+    await Promise.all(stale.map(async ([url, hash]) => {
+      const response = await fetch(url, { cache: 'reload' });
+      if (!response.ok) throw new Error('Precache failed for ' + url);
+      await cache.put(url, response);
+      revisions[url] = hash;
+    }));
+    await cache.put(REVISIONS, new Response(JSON.stringify(revisions)));
+    await self.skipWaiting();
+  })());
+});
+
+self.addEventListener('activate', (event) => {
+  event.waitUntil((async () => {
+    // Drop caches from older workers, and precache entries no longer listed
+    const keys = await caches.keys();
+    await Promise.all(keys.filter((key) => key !== PRECACHE && key !== RUNTIME).map((key) => caches.delete(key)));
+    const cache = await caches.open(PRECACHE);
+    const revisions = {};
+    for (const request of await cache.keys()) {
+      if (request.url.endsWith(REVISIONS)) continue;
+      if (precacheUrls.has(request.url)) {
+        revisions[request.url] = precacheUrls.get(request.url);
+      } else {
+        await cache.delete(request);
+      }
+    }
+    await cache.put(REVISIONS, new Response(JSON.stringify(revisions)));
+    await self.clients.claim();
+  })());
+});
+
+// Page URLs may omit index.html or the .html extension
+function pageKeys(url) {
+  const keys = [url];
+  if (url.endsWith('/')) keys.push(url + 'index.html');
+  else if (!/\\.[a-z0-9]+$/i.test(new URL(url).pathname)) keys.push(url + '.html');
+  return keys;
+}
+
+async function cached(keys) {
+  for (const key of keys) {
+    const response = await caches.match(key);
+    if (response) return response;
+  }
+  return undefined;
+}
+
+async function store(request, response) {
+  if (!response || response.status !== 200 || response.type !== 'basic') return;
+  const cache = await caches.open(precacheUrls.has(request.url) ? PRECACHE : RUNTIME);
+  await cache.put(request, response);
+}
+
+self.addEventListener('fetch', (event) => {
+  const request = event.request;
+  if (request.method !== 'GET') return;
+  if (!request.url.startsWith(self.location.origin)) return;
+  const url = request.url.split('#')[0];
+
+  // waitUntil() must be called while the event is dispatched: once
+  // respondWith() has settled it throws, so each branch registers the
+  // cache update up front. That handler is attached first, so it clones
+  // the response before the page reads its body.
+  if (request.mode === 'navigate' || /\\.html$/.test(new URL(url).pathname)) {
+    // Pages: stale-while-revalidate, with the offline page as last resort
+    const network = fetch(request);
+    event.waitUntil(network.then((response) => store(request, response.clone())).catch(() => {}));
+    event.respondWith((async () => {
+      const hit = await cached(pageKeys(url));
+      if (hit) return hit;
+      try {
+        return await network;
+      } catch (error) {
+        return (await caches.match(new URL('offline.html', scope).href)) || Response.error();
+      }
+    })());
+  } else if (FINGERPRINTED.test(new URL(url).pathname)) {
+    // Fingerprinted assets never change under the same name: cache first
+    const hit = caches.match(request);
+    const network = hit.then((response) => (response ? undefined : fetch(request)));
+    event.waitUntil(network.then((response) => response && store(request, response.clone())).catch(() => {}));
+    event.respondWith(hit.then((response) => response || network));
+  } else {
+    // Everything else: network first, cached copy when offline
+    const network = fetch(request);
+    event.waitUntil(network.then((response) => store(request, response.clone())).catch(() => {}));
+    event.respondWith(network.catch(async () => (await caches.match(request)) || Response.error()));
+  }
+});
+"""
+
+def _service_worker_settings():
+    """Resolve `service_worker` from config.json ({"include": [globs],
+    "exclude": [globs], "max_size": bytes}) into (include, exclude,
+    max_size). Globs match paths relative to the site root."""
+    options = CONFIG.get('service_worker') or {}
+    if not isinstance(options, dict):
+        options = {}
+    include = [str(p) for p in options.get('include', _SW_DEFAULT_INCLUDE)]
+    exclude = [str(p) for p in options.get('exclude', ())]
+    try:
+        max_size = max(0, int(options.get('max_size', _SW_DEFAULT_MAX_SIZE)))
+    except (TypeError, ValueError):
+        max_size = _SW_DEFAULT_MAX_SIZE
+    return include, exclude, max_size
+
 def generate_pwa_files(pages, output_dir):
-    """Generate a web app manifest, PWA icons, offline fallback, and service worker."""
+    """Generate a web app manifest, PWA icons, and offline fallback page;
+    generate_service_worker() writes the worker that precaches them."""
     os.makedirs(output_dir, exist_ok=True)
     theme_color, background_color = get_theme_colors()
     project_name = CONFIG.get('project_name') or 'Documentation'
@@ -802,7 +1201,6 @@ def generate_pwa_files(pages, output_dir):
     language = CONFIG.get('language', 'en')
 
     manifest_path = pathlib.Path(output_dir) / "manifest.json"
-    sw_path = pathlib.Path(output_dir) / "sw.js"
     offline_path = pathlib.Path(output_dir) / "offline.html"
 
     # Generate icon sizes from favicon.png / wingtip-logo.png if available
@@ -820,13 +1218,13 @@ def generate_pwa_files(pages, output_dir):
             # Ensure a favicon exists in the site root for the manifest/PWA
             root_favicon = os.path.join(output_dir, 'favicon.png')
             if source_icon != root_favicon and not os.path.exists(root_favicon):
-                shutil.copy2(source_icon, root_favicon)
+                shutil.copy2(source_icon, _emit_artifact(root_favicon))
             for size, filename in ((192, icon_192), (512, icon_512)):
                 with Image.open(source_icon) as img:
                     if img.mode not in ('RGBA', 'RGB'):
                         img = img.convert('RGBA')
                     img_resized = img.resize((size, size), Image.LANCZOS)
-                    img_resized.save(os.path.join(output_dir, filename), 'PNG')
+                    img_resized.save(_emit_artifact(os.path.join(output_dir, filename)), 'PNG')
         except Exception as e:
             print(f"Warning: Could not generate PWA icons from {source_icon}: {e}")
             icon_192 = ""
@@ -855,6 +1253,7 @@ def generate_pwa_files(pages, output_dir):
         "icons": icons_list
     }
     manifest_path.write_text(json.dumps(manifest, indent=2), encoding='utf8')
+    _emit_artifact(manifest_path)
     print(f"Generated manifest: {manifest_path}")
 
     # Generate offline fallback page
@@ -881,72 +1280,56 @@ def generate_pwa_files(pages, output_dir):
 </body>
 </html>"""
     offline_path.write_text(offline_html, encoding='utf8')
+    _emit_artifact(offline_path)
 
-    # Build the precache list from the generated output directory. This must
-    # run after manifest.json and offline.html are written — the service
-    # worker's offline fallback serves offline.html from this cache, so a
-    # list built earlier ships a fallback that can never be found.
-    precache = []
+def generate_service_worker(output_dir):
+    """Write sw.js, precaching the finished output directory.
+
+    Run it after generate_pwa_files() and output cleanup: the worker's
+    offline fallback serves offline.html from the precache, and a file
+    listed here that cleanup then removes would fail the worker's install.
+    """
+    sw_path = pathlib.Path(output_dir) / "sw.js"
+    include, exclude, max_size = _service_worker_settings()
+    content_images = _IMAGE_CACHE.get('outputs', {})
+    candidates = []
     for root, dirs, files in os.walk(output_dir):
         dirs[:] = [d for d in dirs if not d.startswith('.')]
         for name in files:
             full = os.path.join(root, name)
-            rel = os.path.relpath(full, output_dir).replace(os.sep, '/')
-            if rel == 'sw.js':
+            rel = _relpath(full, output_dir).replace(os.sep, '/')
+            if rel == 'sw.js' or name.startswith('.wingtip-') or name.endswith(_COMPRESSED_SUFFIXES):
                 continue
-            precache.append(rel)
-
-    # Generate service worker
-    cache_version = datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')
-    urls_json = json.dumps(precache)
-    sw_js = f"""const CACHE_VERSION = '{cache_version}';
-const CACHE_NAME = 'wingtip-cache-' + CACHE_VERSION;
-
-const PRECACHE_URLS = {urls_json};
-
-self.addEventListener('install', (event) => {{
-  event.waitUntil(
-    caches.open(CACHE_NAME).then((cache) => {{
-      return cache.addAll(PRECACHE_URLS);
-    }}).then(() => self.skipWaiting())
-  );
-}});
-
-self.addEventListener('activate', (event) => {{
-  event.waitUntil(
-    caches.keys().then((keyList) => {{
-      return Promise.all(keyList.map((key) => {{
-        if (key !== CACHE_NAME) {{
-          return caches.delete(key);
-        }}
-      }}));
-    }}).then(() => self.clients.claim())
-  );
-}});
-
-self.addEventListener('fetch', (event) => {{
-  if (event.request.method !== 'GET') return;
-  if (!event.request.url.startsWith(self.location.origin)) return;
-
-  event.respondWith(
-    caches.match(event.request).then((cached) => {{
-      if (cached) return cached;
-      return fetch(event.request).then((response) => {{
-        if (!response || response.status !== 200 || response.type !== 'basic') return response;
-        const clone = response.clone();
-        caches.open(CACHE_NAME).then((cache) => cache.put(event.request, clone));
-        return response;
-      }}).catch(() => {{
-        if (event.request.mode === 'navigate') {{
-          return caches.match('offline.html');
-        }}
-      }});
-    }})
-  );
-}});
-"""
-    sw_path.write_text(sw_js, encoding='utf8')
-    print(f"Generated service worker: {sw_path}")
+            if rel in content_images:
+                continue
+            if rel in _SW_SHELL:
+                rank = _SW_SHELL.index(rel)
+            else:
+                rank = next((len(_SW_SHELL) + i for i, pattern in enumerate(include) if fnmatch.fnmatch(rel, pattern)), None)
+                if rank is None or any(fnmatch.fnmatch(rel, pattern) for pattern in exclude):
+                    continue
+            candidates.append((rank, rel, full))
+
+    # Each entry carries its content hash: an updated worker re-fetches
+    # only entries whose hash changed, and sw.js itself is byte-identical
+    # across builds that change nothing it precaches.
+    precache = []
+    total = skipped = 0
+    for _, rel, full in sorted(candidates):
+        size = os.path.getsize(full)
+        if max_size and total + size > max_size:
+            skipped += 1
+            continue
+        total += size
+        precache.append([rel, (_file_digest(full) or '')[:16]])
+    if skipped:
+        print(f"Note: service worker precache is capped at {max_size} bytes; {skipped} file(s) left to runtime caching")
+
+    sw_js = _SERVICE_WORKER_JS.replace('__PRECACHE__', json.dumps(precache, separators=(',', ':')))
+    if not sw_path.exists() or sw_path.read_text(encoding='utf8') != sw_js:
+        sw_path.write_text(sw_js, encoding='utf8')
+    _emit_artifact(sw_path)
+    print(f"Generated service worker: {sw_path} ({len(precache)} files, {total // 1024} KB precached)")
 
 def generate_syntax_css():
     """Generate syntax highlighting CSS for both light and dark modes"""
@@ -985,7 +1368,7 @@ def generate_syntax_css():
 }}
 '''
     
-    css_path = os.path.join(OUTPUT_DIR, 'syntax.css')
+    css_path = _emit_artifact(os.path.join(OUTPUT_DIR, 'syntax.css'))
     with open(css_path, 'w') as f:
         f.write(css_content)
 
@@ -1003,6 +1386,130 @@ def package_static_dir():
     return local if os.path.isdir(local) else None
 
 
+ASSET_MANIFEST_NAME = "asset-manifest.json"
+_ASSET_MAP = {}
+_STATIC_PUBLISHED = {}  # dest dir -> (inputs, published names, output stamps) of its last publish
+_FAVICON_FETCHED = {}  # favicon path -> (url, stamp) of the copy downloaded there
+_PAGE_TEMPLATE = None
+_CSS_URL_RE = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+_TEMPLATE_ASSET_RE = re.compile(r"""(\$\{?(?:base_url|page_relative_root)\}?/static/)([^"'\s)?#]+)""")
+
+def _fingerprinted_name(rel, digest):
+    """css/custom.css -> css/custom.<digest[:8]>.css"""
+    stem, ext = posixpath.splitext(rel)
+    return f"{stem}.{digest[:8]}{ext}"
+
+def _rewrite_css_urls(css, rel, resolve):
+    """Point url() references in a stylesheet at published asset names."""
+    base = posixpath.dirname(rel)
+
+    def replace(match):
+        quote, ref = match.group(1), match.group(2).strip()
+        if ref.startswith(('data:', 'http://', 'https://', '//', '#', '/')):
+            return match.group(0)
+        path, sep, suffix = ref, '', ''
+        cut = re.search(r'[?#]', ref)
+        if cut:
+            path, sep, suffix = ref[:cut.start()], ref[cut.start()], ref[cut.start() + 1:]
+        target = resolve(posixpath.normpath(posixpath.join(base, path)))
+        if target is None:
+            return match.group(0)
+        new_ref = posixpath.relpath(target, base or '.') + sep + suffix
+        return f"url({quote}{new_ref}{quote})"
+
+    return _CSS_URL_RE.sub(replace, css)
+
+def _publish_static_assets(sources, dest_dir):
+    """Publish static assets into dest_dir; returns how many files were written.
+
+    sources maps static-relative paths to source files (the project overlay
+    already layered over the package defaults). With `fingerprint_assets`
+    enabled, every asset is published under a content-hashed name and
+    stylesheets' url() references are rewritten to match, so the whole
+    static/ tree can be served with immutable cache headers; the template
+    picks the names up from _ASSET_MAP and asset-manifest.json records them.
+    Files whose published copy already exists with the same content are
+    not rewritten; files from earlier builds are left to cleanup_output_dir.
+    A rebuild in the same process skips all of that when neither the
+    sources nor the files last published into dest_dir have changed.
+    """
+    global _PAGE_TEMPLATE
+    # Opt-in: hashed names replace the originals, which breaks links to
+    # static/ files by name from head snippets, pages or other sites
+    fingerprint = CONFIG.get("fingerprint_assets") is True
+    manifest_path = os.path.join(OUTPUT_DIR, ASSET_MANIFEST_NAME)
+    inputs = (fingerprint, manifest_path, sorted((rel, src, _file_stamp(src)) for rel, src in sources.items()))
+    previous = _STATIC_PUBLISHED.get(dest_dir)
+    if previous and previous[0] == inputs and all(_file_stamp(path) == stamp for path, stamp in previous[2].items()):
+        for path in previous[2]:
+            _emit_artifact(path)
+        _ASSET_MAP.clear()
+        _ASSET_MAP.update({rel: name for rel, name in previous[1].items() if rel != name})
+        _PAGE_TEMPLATE = None
+        return 0
+    published = {}
+    in_progress = set()
+    written = 0
+
+    def publish(rel):
+        nonlocal written
+        if rel in published:
+            return published[rel]
+        if rel not in sources or rel in in_progress:
+            return None
+        in_progress.add(rel)
+        src = sources[rel]
+        data = None
+        if rel.endswith('.css'):
+            css = pathlib.Path(src).read_text(encoding='utf8')
+            rewritten = _rewrite_css_urls(css, rel, publish)
+            if rewritten != css:
+                data = rewritten.encode('utf8')
+        digest = _digest(data) if data is not None else _file_digest(src)
+        name = _fingerprinted_name(rel, digest) if fingerprint else rel
+        dest = os.path.join(dest_dir, name)
+        if not (os.path.exists(dest) and _file_digest(dest) == digest):
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            if data is None:
+                _write_atomically(dest, lambda tmp: shutil.copy2(src, tmp))
+            else:
+                _write_atomically(dest, lambda tmp: pathlib.Path(tmp).write_bytes(data))
+            written += 1
+        in_progress.discard(rel)
+        published[rel] = name
+        return name
+
+    for rel in sorted(sources):
+        publish(rel)
+
+    # Recorded as artifacts: copies an earlier build published under other
+    # names are removed by cleanup_output_dir, and pages or content images
+    # that share static/ are left alone
+    for name in published.values():
+        _emit_artifact(os.path.join(dest_dir, name))
+
+    _ASSET_MAP.clear()
+    _ASSET_MAP.update({rel: name for rel, name in published.items() if rel != name})
+    _PAGE_TEMPLATE = None
+    with open(_emit_artifact(manifest_path), "w", encoding="utf8") as f:
+        json.dump({f"static/{rel}": f"static/{name}" for rel, name in sorted(published.items())}, f, indent=2)
+    outputs = {}
+    for path in [os.path.join(dest_dir, name) for name in published.values()] + [manifest_path]:
+        st = os.stat(path)
+        outputs[os.path.normpath(path)] = (st.st_mtime_ns, st.st_size)
+    _STATIC_PUBLISHED[dest_dir] = (inputs, published, outputs)
+    return written
+
+def _page_template():
+    """The page template with static asset references pointing at the
+    published (fingerprinted) names."""
+    global _PAGE_TEMPLATE
+    if _PAGE_TEMPLATE is None:
+        text = _TEMPLATE_ASSET_RE.sub(
+            lambda m: m.group(1) + _ASSET_MAP.get(m.group(2), m.group(2)), TEMPLATE.template)
+        _PAGE_TEMPLATE = Template(text)
+    return _PAGE_TEMPLATE
+
 def copy_static_files():
     """Copy static files to output directory"""
     os.makedirs(OUTPUT_DIR, exist_ok=True)
@@ -1010,14 +1517,23 @@ def copy_static_files():
     # Generate syntax highlighting CSS
     generate_syntax_css()
     
-    # Handle favicon
+    # Handle favicon; a rebuild in the same process (the dev server) does
+    # not fetch it again while the copy it downloaded is still in place
     favicon_dest = os.path.join(OUTPUT_DIR, "favicon.png")
     if CONFIG.get("favicon"):
-        try:
-            import urllib.request
-            urllib.request.urlretrieve(CONFIG["favicon"], favicon_dest)
-        except Exception as e:
-            print(f"Warning: Failed to download favicon: {e}")
+        fetched = _FAVICON_FETCHED.get(favicon_dest)
+        if fetched and fetched == (CONFIG["favicon"], _file_stamp(favicon_dest)):
+            _emit_artifact(favicon_dest)
+        else:
+            try:
+                import urllib.request
+                urllib.request.urlretrieve(CONFIG["favicon"], favicon_dest)
+                _emit_artifact(favicon_dest)
+                st = os.stat(favicon_dest)
+                _FAVICON_FETCHED[favicon_dest] = (CONFIG["favicon"], (st.st_mtime_ns, st.st_size))
+            except Exception as e:
+                _FAVICON_FETCHED.pop(favicon_dest, None)
+                print(f"Warning: Failed to download favicon: {e}")
 
     # Static assets resolve in two layers:
     #
@@ -1029,32 +1545,29 @@ def copy_static_files():
     # requested static/css/custom.css and got three 404s and an unstyled site.
     static_dest_dir = os.path.join(OUTPUT_DIR, "static")
 
-    if os.path.exists(static_dest_dir):
-        if os.path.isdir(static_dest_dir):
-            shutil.rmtree(static_dest_dir)
-        else:
-            os.remove(static_dest_dir)
+    if os.path.exists(static_dest_dir) and not os.path.isdir(static_dest_dir):
+        os.remove(static_dest_dir)
 
+    sources = {}
     copied_from = []
-
     pkg_static = package_static_dir()
-    if pkg_static and os.path.isdir(pkg_static):
-        try:
-            shutil.copytree(pkg_static, static_dest_dir)
-            copied_from.append("package defaults")
-        except Exception as e:
-            print(f"Warning: Could not copy bundled static assets: {e}")
-
     project_static = "static"
-    if os.path.isdir(project_static):
-        try:
-            shutil.copytree(project_static, static_dest_dir, dirs_exist_ok=True)
-            copied_from.append(f"'{project_static}'")
-        except Exception as e:
-            print(f"Warning: Could not copy static assets from '{project_static}': {e}")
+    for label, root in (("package defaults", pkg_static), (f"'{project_static}'", project_static)):
+        if not root or not os.path.isdir(root):
+            continue
+        for dirpath, _, filenames in os.walk(root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                sources[os.path.relpath(path, root).replace(os.sep, '/')] = path
+        copied_from.append(label)
 
     if copied_from:
-        print(f"Copied static assets ({' + '.join(copied_from)}) to '{static_dest_dir}'")
+        try:
+            written = _publish_static_assets(sources, static_dest_dir)
+            print(f"Copied static assets ({' + '.join(copied_from)}) to '{static_dest_dir}' "
+                  f"({written} written, {len(sources) - written} unchanged)")
+        except Exception as e:
+            print(f"Warning: Could not copy static assets: {e}")
     else:
         print("Warning: no static assets found; pages will render unstyled.")
 
@@ -1062,7 +1575,7 @@ def copy_static_files():
     # so the favicon meta tag and PWA manifest can resolve it locally.
     if os.path.isfile('favicon.png'):
         try:
-            shutil.copy2('favicon.png', os.path.join(OUTPUT_DIR, 'favicon.png'))
+            shutil.copy2('favicon.png', _emit_artifact(os.path.join(OUTPUT_DIR, 'favicon.png')))
             print("Copied favicon.png to output root")
         except Exception as e:
             print(f"Warning: Could not copy favicon.png: {e}")
@@ -1113,7 +1626,7 @@ def _doc_html_filename(md_path, docs_dir='docs'):
     """
     if md_path == 'README.md':
         return 'index.html'
-    rel = os.path.relpath(md_path, docs_dir)
+    rel = _relpath(md_path, docs_dir)
     if rel.startswith('..'):
         # Source outside docs/ (e.g. 404.md in the project root)
         rel = os.path.basename(md_path)
@@ -1124,34 +1637,50 @@ def _doc_html_filename(md_path, docs_dir='docs'):
     stem = os.path.splitext(basename)[0]
     return f"{dirname}/{stem}.html" if dirname else f"{stem}.html"
 
+_DOC_FILES_CACHE = {}
+_CATEGORY_META = {}
+
 def _discover_doc_files(docs_dir='docs'):
     """Recursively find markdown files under docs_dir in stable sorted order.
 
     Skips hidden and underscore-prefixed directories and never descends into
-    the build output directory (docs/site by default lives inside docs/).
+    the build output directory (docs/site by default lives inside docs/) or
+    any other build output, recognised by its build manifest: the dev
+    server builds into a standby directory while docs/site holds the
+    previous build. The walk happens once per build; it also indexes every directory's
+    _category.json for _load_category_meta.
     """
+    out_abs = os.path.abspath(OUTPUT_DIR)
+    cache_key = (os.path.abspath(docs_dir), out_abs)
+    if cache_key in _DOC_FILES_CACHE:
+        return list(_DOC_FILES_CACHE[cache_key])
+
     found = []
     if not os.path.isdir(docs_dir):
         return found
-    out_abs = os.path.abspath(OUTPUT_DIR)
     for dirpath, dirnames, filenames in os.walk(docs_dir):
         dirnames[:] = sorted(
             d for d in dirnames
             if not d.startswith(('.', '_'))
             and os.path.abspath(os.path.join(dirpath, d)) != out_abs
+            and not os.path.isfile(os.path.join(dirpath, d, BUILD_MANIFEST_NAME))
         )
+        meta_key = os.path.normpath(dirpath)
+        if meta_key not in _CATEGORY_META:
+            _CATEGORY_META[meta_key] = _read_category_meta(dirpath) if '_category.json' in filenames else {}
         for name in sorted(filenames):
             if name.endswith('.md'):
                 found.append(os.path.join(dirpath, name))
-    return found
+    _DOC_FILES_CACHE[cache_key] = found
+    return list(found)
 
 def _rel_href(from_rel, to_rel):
     """Relative URL from one output-relative page path to another."""
     rel = os.path.relpath(to_rel, os.path.dirname(from_rel) or '.')
     return rel.replace(os.sep, '/')
 
-def _load_category_meta(category_dir):
-    """Read _category.json metadata if present."""
+def _read_category_meta(category_dir):
+    """Read _category.json metadata from disk if present."""
     category_json = os.path.join(category_dir, '_category.json')
     if os.path.exists(category_json):
         try:
@@ -1160,6 +1689,19 @@ def _load_category_meta(category_dir):
             print(f"Warning: Could not read {category_json}: {e}")
     return {}
 
+def _load_category_meta(category_dir):
+    """_category.json metadata for a directory, from the build-wide index.
+
+    Directories outside the discovered doc tree are read on first use and
+    remembered, so a malformed file warns once per build. Treat the result
+    as read-only.
+    """
+    key = os.path.normpath(category_dir)
+    meta = _CATEGORY_META.get(key)
+    if meta is None:
+        meta = _CATEGORY_META[key] = _read_category_meta(category_dir)
+    return meta
+
 def _category_for_path(md_path, docs_dir='docs', front_matter=None):
     """Return (category_slug, category_name) for a markdown file."""
     if front_matter and front_matter.get('category'):
@@ -1181,16 +1723,55 @@ def _category_for_path(md_path, docs_dir='docs', front_matter=None):
             return (_slugify(name), name)
     return None, None
 
-def extract_title(md):
-    front = parse_frontmatter(md)
+def extract_title(md, front=None):
+    if front is None:
+        front = parse_frontmatter(md)
     if front.get('title'):
         return str(front['title']).strip()
     match = re.search(r"^# (.+)", md, re.MULTILINE)
     return match.group(1).strip() if match else "Untitled"
 
+_SOURCE_CACHE = {}
+
+def load_source(md_path):
+    """Read and parse a Markdown source once, until the file changes.
+
+    Returns a dict with the raw text, parsed front matter, body without
+    front matter, title, frontmatter category, and noindex flag. Every stage
+    (navigation, page rendering, search, feed, concatenated docs, section
+    hubs) reads sources through here, so a file is read and its YAML parsed
+    once and all stages see the same document. Treat the result as
+    read-only; convert_markdown_file copies the front matter before handing
+    it to plugin hooks.
+    """
+    stamp = _file_stamp(md_path)
+    stamp_doc = _SOURCE_CACHE.get(md_path)
+    doc = stamp_doc[1] if stamp_doc and stamp_doc[0] == stamp else None
+    if doc is None:
+        raw = pathlib.Path(md_path).read_text(encoding='utf8')
+        front = parse_frontmatter(raw)
+        is_dict = isinstance(front, dict)
+        doc = {
+            'path': md_path,
+            'raw': raw,
+            'front': front,
+            'body': remove_frontmatter(raw),
+            'title': extract_title(raw, front if is_dict else {}),
+            'category': str(front.get('category', '') or '').strip() if is_dict else '',
+            'noindex': _front_is_noindex(front),
+        }
+        _SOURCE_CACHE[md_path] = (stamp, doc)
+    return doc
+
+def _source_corpus(docs_dir='docs'):
+    """README.md (when present) followed by every discovered doc, in build order."""
+    paths = ['README.md'] if os.path.exists('README.md') else []
+    return [load_source(path) for path in paths + _discover_doc_files(docs_dir)]
+
 
 
 _NAV_CACHE = None
+_NAV_HTML_CACHE = {}
 _PAGE_URL_CACHE = None
 
 def _all_page_urls():
@@ -1230,9 +1811,8 @@ def _collect_nav_data(docs_dir='docs'):
         if os.path.basename(md_path) == '404.md':
             continue
         try:
-            text = pathlib.Path(md_path).read_text(encoding='utf8')
-            front = parse_frontmatter(text)
-            title = extract_title(text)
+            doc = load_source(md_path)
+            front, title = doc['front'], doc['title']
         except Exception:
             front, title = {}, os.path.splitext(os.path.basename(md_path))[0]
         entry = {
@@ -1240,7 +1820,7 @@ def _collect_nav_data(docs_dir='docs'):
             'href': _doc_html_filename(md_path, docs_dir),
             'order': _nav_page_order(front),
         }
-        rel_dir = os.path.relpath(os.path.dirname(md_path), docs_dir)
+        rel_dir = _relpath(os.path.dirname(md_path), docs_dir)
         if rel_dir == '.':
             category = str(front.get('category', '') or '').strip() if isinstance(front, dict) else ''
             if category:
@@ -1256,25 +1836,31 @@ def _collect_nav_data(docs_dir='docs'):
     _NAV_CACHE = (tree, categories)
     return _NAV_CACHE
 
-def _render_nav_group(dirname, rel_dir, node, docs_dir, active_html, prefix):
-    """Render one directory group as a collapsible <details> block."""
+_NAV_ACTIVE = ' class="active"'
+_NAV_OPEN = ' open'
+
+def _render_nav_group(dirname, rel_dir, node, docs_dir, prefix, lines):
+    """Append one directory group, as a collapsible <details> block, to lines.
+
+    Each line is a list of strings and slots: ('active', href) where a link
+    gets class="active", ('open', group_prefix) where <details> opens.
+    """
     meta = _load_category_meta(os.path.join(docs_dir, rel_dir))
     name = meta.get('name') or dirname.replace('-', ' ').replace('_', ' ').title()
     group_prefix = rel_dir.replace(os.sep, '/') + '/'
-    is_open = ' open' if active_html.startswith(group_prefix) else ''
 
-    parts = [f'<li class="nav-group"><details{is_open}><summary>{html_module.escape(str(name))}</summary><ul>']
+    lines.append(['<li class="nav-group"><details', ('open', group_prefix), f'><summary>{html_module.escape(str(name))}</summary><ul>'])
     if meta.get('index'):
         overview_href = group_prefix + 'index.html'
-        active_class = ' class="active"' if overview_href == active_html else ''
-        parts.append(f'<li><a href="{prefix}{overview_href}"{active_class}>Overview</a></li>')
+        lines.append([f'<li><a href="{prefix}{overview_href}"', ('active', overview_href), '>Overview</a></li>'])
     for page in _sorted_nav_pages(node['pages']):
-        active_class = ' class="active"' if page['href'] == active_html else ''
-        parts.append(f'<li><a href="{prefix}{page["href"]}"{active_class}>{html_module.escape(page["title"])}</a></li>')
+        lines.append(_nav_link_line(page, prefix))
     for child in _sorted_nav_groups(node['children'], rel_dir, docs_dir):
-        parts.append(_render_nav_group(child, os.path.join(rel_dir, child), node['children'][child], docs_dir, active_html, prefix))
-    parts.append('</ul></details></li>')
-    return '\n'.join(parts)
+        _render_nav_group(child, os.path.join(rel_dir, child), node['children'][child], docs_dir, prefix, lines)
+    lines.append(['</ul></details></li>'])
+
+def _nav_link_line(page, prefix):
+    return [f'<li><a href="{prefix}{page["href"]}"', ('active', page['href']), f'>{html_module.escape(page["title"])}</a></li>']
 
 def _sorted_nav_groups(children, parent_rel, docs_dir):
     """Order sibling directory groups by _category.json `order`, then name."""
@@ -1298,7 +1884,8 @@ def generate_redirect_pages(output_dir):
     with no redirect support (GitHub Pages), and a `_redirects` file in
     Netlify/Cloudflare Pages format covering every rule, with platform
     wildcard patterns (:slug*) translated to splats. Returns the emitted
-    file paths so they survive output cleanup.
+    file paths. Run it after every page is written: a rule whose source is
+    one of this build's files gets no static page.
     """
     redirects = CONFIG.get('redirects') or []
     if not isinstance(redirects, list) or not redirects:
@@ -1335,7 +1922,9 @@ def generate_redirect_pages(output_dir):
         else:
             out_rel = rel_src + '.html'
         out_path = os.path.join(output_dir, out_rel)
-        if os.path.exists(out_path):
+        # A collision is with a file this build wrote; what is on disk may
+        # be the previous build's redirect page
+        if posixpath.normpath(out_rel) in _ARTIFACTS:
             print(f"Warning: redirect source {src} collides with existing page {out_rel}; static page skipped")
             continue
 
@@ -1347,7 +1936,7 @@ def generate_redirect_pages(output_dir):
                 target_rel = 'index.html'
             elif not target_rel.endswith('.html') and '.' not in os.path.basename(target_rel):
                 target_rel += '.html'
-            if not os.path.exists(os.path.join(output_dir, target_rel)):
+            if posixpath.normpath(target_rel) not in _ARTIFACTS and not os.path.exists(os.path.join(output_dir, target_rel)):
                 print(f"Warning: redirect target {dst} not found in the build ({target_rel})")
             href = os.path.relpath(target_rel, os.path.dirname(out_rel)).replace(os.sep, '/')
 
@@ -1377,13 +1966,13 @@ def generate_redirect_pages(output_dir):
         if os.path.dirname(out_path):
             os.makedirs(os.path.dirname(out_path), exist_ok=True)
         pathlib.Path(out_path).write_text(page_html, encoding='utf8')
-        emitted.append(out_path)
+        emitted.append(_emit_artifact(out_path))
         page_count += 1
 
     if host_lines:
         host_path = os.path.join(output_dir, '_redirects')
         pathlib.Path(host_path).write_text('\n'.join(host_lines) + '\n', encoding='utf8')
-        emitted.append(host_path)
+        emitted.append(_emit_artifact(host_path))
         print(f"Generated {page_count} static redirect page(s) and _redirects ({len(host_lines)} rules)")
     return emitted
 
@@ -1400,12 +1989,12 @@ def _generate_section_hubs(docs_dir, seen_outputs, nav_pages, search_data_for_in
         lines = []
         for page in _sorted_nav_pages(node['pages']):
             href = page['href']
-            link = os.path.relpath(href, rel).replace(os.sep, '/')
+            link = _relpath(href, rel).replace(os.sep, '/')
             desc = ''
             src = os.path.join(docs_dir, href[:-len('.html')] + '.md')
             if os.path.exists(src):
                 try:
-                    d = parse_frontmatter(pathlib.Path(src).read_text(encoding='utf8')).get('description')
+                    d = load_source(src)['front'].get('description')
                     desc = f" — {str(d).strip()}" if d else ''
                 except Exception:
                     pass
@@ -1431,7 +2020,10 @@ def _generate_section_hubs(docs_dir, seen_outputs, nav_pages, search_data_for_in
                 lines.extend(render_entries(sub, child_rel))
                 content = "\n".join(lines) + "\n"
                 tmp = pathlib.Path(tempfile.gettempdir()) / f"wingtip_hub_{child_rel.replace(os.sep, '_')}.md"
-                tmp.write_text(content, encoding='utf8')
+                # Rewriting an unchanged hub would bump its mtime (its date)
+                # and re-render it on every incremental build
+                if not tmp.exists() or tmp.read_text(encoding='utf8') != content:
+                    tmp.write_text(content, encoding='utf8')
                 seen_outputs[html_filename] = str(tmp)
                 nav_pages.append((name, html_filename, str(tmp),
                                   {'description': desc, '_wingtip_synthetic': True}))
@@ -1472,51 +2064,95 @@ def build_breadcrumbs(rel_out, title, category, page_root, docs_dir='docs'):
     parts.append('</ol></nav>')
     return ''.join(parts)
 
-def build_navigation(active_html: str) -> str:
-    """Build the sidebar navigation HTML: root pages, frontmatter category
-    groups, and nested directory groups with collapsible sections.
-    active_html is the page's site-root-relative output filename."""
-    docs_dir = 'docs'
-    # Links are emitted relative to the current page's depth so they work on
-    # any hosting setup, including file:// and zero-config local previews.
-    prefix = '../' * active_html.count('/')
+def _build_nav_skeleton(prefix):
+    """Render the sidebar for one page depth with per-page state left open.
 
+    Returns (html, active_at, open_at): the sidebar with every active/open
+    marker omitted, plus the string offsets where ' class="active"' goes
+    for each href and ' open' goes for each group prefix.
+    """
+    docs_dir = 'docs'
     tree, categories = _collect_nav_data(docs_dir)
 
-    nav_html = ['<nav class="navigation" aria-label="Documentation">']
-    nav_html.append('<h2>Documentation</h2>')
-    nav_html.append('<ul>')
+    lines = [['<nav class="navigation" aria-label="Documentation">'], ['<h2>Documentation</h2>'], ['<ul>']]
 
     # README / Home
     if os.path.exists('README.md'):
-        active_class = ' class="active"' if active_html == 'index.html' else ''
-        nav_html.append(f'<li><a href="{prefix}index.html"{active_class}>README</a></li>')
+        lines.append([f'<li><a href="{prefix}index.html"', ('active', 'index.html'), '>README</a></li>'])
 
     # Uncategorized top-level pages
     for page in _sorted_nav_pages(tree['pages']):
-        active_class = ' class="active"' if page['href'] == active_html else ''
-        nav_html.append(f'<li><a href="{prefix}{page["href"]}"{active_class}>{html_module.escape(page["title"])}</a></li>')
+        lines.append(_nav_link_line(page, prefix))
 
     # Frontmatter category groups
     for category in sorted(categories, key=str.lower):
-        nav_html.append('</ul>')
-        nav_html.append(f'<h3 class="nav-category">{html_module.escape(category)}</h3>')
-        nav_html.append('<ul>')
+        lines.append(['</ul>'])
+        lines.append([f'<h3 class="nav-category">{html_module.escape(category)}</h3>'])
+        lines.append(['<ul>'])
         for page in _sorted_nav_pages(categories[category]):
-            active_class = ' class="active"' if page['href'] == active_html else ''
-            nav_html.append(f'<li><a href="{prefix}{page["href"]}"{active_class}>{html_module.escape(page["title"])}</a></li>')
+            lines.append(_nav_link_line(page, prefix))
 
     # Nested directory groups
     for dirname in _sorted_nav_groups(tree['children'], '', docs_dir):
-        nav_html.append(_render_nav_group(dirname, dirname, tree['children'][dirname], docs_dir, active_html, prefix))
+        _render_nav_group(dirname, dirname, tree['children'][dirname], docs_dir, prefix, lines)
+
+    lines.append(['</ul>'])
+    lines.append(['</nav>'])
+
+    out, offset = [], 0
+    active_at, open_at = {}, {}
+    for i, line in enumerate(lines):
+        if i:
+            out.append('\n')
+            offset += 1
+        for part in line:
+            if isinstance(part, tuple):
+                kind, key = part
+                (active_at if kind == 'active' else open_at).setdefault(key, []).append(offset)
+            else:
+                out.append(part)
+                offset += len(part)
+    return ''.join(out), active_at, open_at
+
+def build_navigation(active_html: str) -> str:
+    """Build the sidebar navigation HTML: root pages, frontmatter category
+    groups, and nested directory groups with collapsible sections.
+    active_html is the page's site-root-relative output filename.
 
-    nav_html.append('</ul>')
-    nav_html.append('</nav>')
-    return '\n'.join(nav_html)
+    The sidebar only varies by page depth (the ../ prefix) and by which
+    link is active and which groups are open, so it is rendered once per
+    depth and the per-page markers are spliced in."""
+    # Links are emitted relative to the current page's depth so they work on
+    # any hosting setup, including file:// and zero-config local previews.
+    prefix = '../' * active_html.count('/')
+    skeleton = _NAV_HTML_CACHE.get(prefix)
+    if skeleton is None:
+        skeleton = _NAV_HTML_CACHE[prefix] = _build_nav_skeleton(prefix)
+    html, active_at, open_at = skeleton
+
+    marks = [(at, _NAV_ACTIVE) for at in active_at.get(active_html, ())]
+    dirs = active_html.split('/')[:-1]
+    for depth in range(1, len(dirs) + 1):
+        marks.extend((at, _NAV_OPEN) for at in open_at.get('/'.join(dirs[:depth]) + '/', ()))
+    if not marks:
+        return html
+
+    parts, last = [], 0
+    for at, mark in sorted(marks):
+        parts.append(html[last:at])
+        parts.append(mark)
+        last = at
+    parts.append(html[last:])
+    return ''.join(parts)
 
 def add_codeblock_copy_buttons(html: str) -> str:
     """Add copy buttons to code blocks."""
     soup = BeautifulSoup(html, 'html.parser')
+    _add_codeblock_copy_buttons(soup)
+    return str(soup)
+
+def _add_codeblock_copy_buttons(soup):
+    """Add copy buttons to the code blocks of an already parsed page, in place."""
     for i, code in enumerate(soup.select('pre > code')):
         # Normalize class="language-xyz" to class="xyz"
         classes = code.get('class', [])
@@ -1542,8 +2178,6 @@ def add_codeblock_copy_buttons(html: str) -> str:
         code['id'] = f'code-{i}'
         code['tabindex'] = '0'
 
-    return str(soup)
-
 def _get_image_size(path):
     """Return (width, height) for a local image file, or None on failure."""
     try:
@@ -1584,16 +2218,140 @@ def _resolve_image_source(src, input_path):
             return norm
     return None
 
-def _process_content_images(soup, input_path, output_filename):
-    """Copy local content images to output, generate responsive srcset sizes, and add lazy loading."""
+def _write_atomically(path, write):
+    """Call write(tmp_path) and move the result into place.
+
+    Parallel page renders can share an image; a temp file per process means
+    no page ever sees a half-written copy or variant. The temp name keeps
+    the extension so Pillow still infers the output format.
+    """
+    stem, ext = os.path.splitext(path)
+    tmp = f"{stem}.{os.getpid()}.tmp{ext}"
+    write(tmp)
+    os.replace(tmp, path)
+
+IMAGE_CACHE_NAME = ".wingtip-images.json"
+_IMAGE_CACHE_VERSION = 1
+_RESPONSIVE_WIDTHS = (480, 800, 1200, 1600)
+# Persistent image cache: "images" maps a source content digest to its
+# {"size": [w, h]} (or {"error": message} when Pillow can't read it);
+# "outputs" maps each published copy/variant (relative to OUTPUT_DIR) to
+# the digest of the source it was generated from, suffixed with
+# ":<quality>" for WebP/AVIF re-encodes.
+_IMAGE_CACHE = {"images": {}, "outputs": {}}
+
+def _load_image_cache(output_dir):
+    """Load the previous build's image cache from output_dir, if usable."""
+    _IMAGE_CACHE['images'] = {}
+    _IMAGE_CACHE['outputs'] = {}
+    path = os.path.join(output_dir, IMAGE_CACHE_NAME)
+    if not os.path.exists(path):
+        return
+    try:
+        cached = json.loads(pathlib.Path(path).read_text(encoding='utf8'))
+        if cached.get('version') == _IMAGE_CACHE_VERSION:
+            _IMAGE_CACHE['images'] = dict(cached['images'])
+            _IMAGE_CACHE['outputs'] = dict(cached['outputs'])
+    except Exception:
+        pass
+
+def _write_image_cache(output_dir):
+    """Persist the image cache, dropping outputs that no longer exist and
+    sources no published file was generated from."""
+    outputs = {rel: digest for rel, digest in _IMAGE_CACHE['outputs'].items()
+               if os.path.exists(os.path.join(output_dir, rel))}
+    used = {token.split(':')[0] for token in outputs.values()}
+    cache = {
+        "version": _IMAGE_CACHE_VERSION,
+        "images": {digest: info for digest, info in _IMAGE_CACHE['images'].items() if digest in used},
+        "outputs": outputs,
+    }
+    path = os.path.join(output_dir, IMAGE_CACHE_NAME)
+    pathlib.Path(path).write_text(json.dumps(cache, indent=2, sort_keys=True), encoding='utf8')
+
+def _image_info(src_path, digest):
+    """Cached {"size": [w, h]} or {"error": ...} for a source image.
+
+    Only an image whose content has not been seen before is opened, and then
+    only to read its header; None when Pillow is not installed.
+    """
+    info = _IMAGE_CACHE['images'].get(digest)
+    if info is None:
+        try:
+            from PIL import Image
+        except ImportError:
+            return None
+        try:
+            with Image.open(src_path) as im:
+                info = {"size": list(im.size)}
+        except Exception as e:
+            info = {"error": str(e)}
+        _IMAGE_CACHE['images'][digest] = info
+    return info
+
+# Re-encoded formats for "modern_images", best first: (suffix, Pillow
+# format, MIME type, default quality)
+_MODERN_IMAGE_FORMATS = (
+    ('.avif', 'AVIF', 'image/avif', 55),
+    ('.webp', 'WEBP', 'image/webp', 80),
+)
+_MODERN_IMAGE_SOURCES = {'.png', '.jpg', '.jpeg'}
+
+def _modern_image_settings():
+    """Resolve `modern_images` from config.json (true, or {"formats": [...],
+    "quality": N or {"webp": N, "avif": N}}) into [(suffix, MIME type,
+    quality)] for the formats this Pillow can write, best first."""
+    setting = CONFIG.get('modern_images', False)
+    if not setting:
+        return []
+    options = setting if isinstance(setting, dict) else {}
+    formats = [str(f).lower().lstrip('.') for f in options.get('formats', ('avif', 'webp'))]
+    quality = options.get('quality', {})
     try:
         from PIL import Image
+        Image.init()
     except ImportError:
-        # If Pillow is missing, skip image processing but still add lazy loading attributes
-        Image = None
-
+        return []
+    settings = []
+    for suffix, pil_format, mime, default_quality in _MODERN_IMAGE_FORMATS:
+        name = suffix.lstrip('.')
+        if name not in formats or pil_format not in Image.SAVE:
+            continue
+        q = quality.get(name, default_quality) if isinstance(quality, dict) else quality
+        try:
+            q = max(1, min(100, int(q)))
+        except (TypeError, ValueError):
+            q = default_quality
+        settings.append((suffix, mime, q))
+    return settings
+
+def _image_variant_path(output_image_path, width=None, format_suffix=''):
+    """Path of a copy of output_image_path scaled to width and/or re-encoded
+    to format_suffix ('.webp'): img/shot-480w.png, img/shot-480w.png.webp.
+    The original extension stays in re-encoded names so shot.png and
+    shot.jpg never share one."""
+    name, ext = os.path.splitext(output_image_path)
+    if width:
+        name = f"{name}-{width}w"
+    return f"{name}{ext}{format_suffix}"
+
+def _process_content_images(soup, input_path, output_filename, build_record=None):
+    """Point local content images at their published copies, add responsive
+    srcset sizes, and add lazy loading.
+
+    Dimensions come from the image cache, so rendering never resizes: the
+    copy and the scaled variants a page references are queued as image jobs
+    on build_record['images'] for generate_images() to produce once per
+    source after all pages are rendered. With `modern_images` enabled, PNG
+    and JPEG images are also wrapped in <picture> with AVIF/WebP <source>s.
+    When build_record is given, the source images read and the files they
+    publish are also appended to its 'inputs' and 'outputs' lists; without
+    one the jobs run immediately.
+    """
     page_output_dir = os.path.dirname(output_filename)
     source_root = os.getcwd()
+    image_jobs = build_record.setdefault('images', []) if build_record is not None else []
+    modern_formats = _modern_image_settings()
 
     for img in soup.find_all('img'):
         if not img.get('loading'):
@@ -1614,48 +2372,162 @@ def _process_content_images(soup, input_path, output_filename):
         if src_rel.startswith(docs_prefix):
             src_rel = src_rel[len(docs_prefix):]
         output_image_path = os.path.normpath(os.path.join(OUTPUT_DIR, src_rel))
-        if not os.path.exists(os.path.dirname(output_image_path)):
-            os.makedirs(os.path.dirname(output_image_path), exist_ok=True)
 
-        # Copy the original image to the output tree and update the src attribute
+        # The original is published alongside the page output; update the src attribute
         new_src = os.path.relpath(output_image_path, page_output_dir).replace(os.sep, '/')
-        if not os.path.exists(output_image_path) or os.path.getmtime(src_path) > os.path.getmtime(output_image_path):
-            shutil.copy2(src_path, output_image_path)
         img['src'] = new_src
+        digest = _file_digest(src_path)
+        job = {"source": src_path, "digest": digest, "output": output_image_path, "variants": []}
+        image_jobs.append(job)
+        if build_record is not None:
+            build_record['inputs'].append(src_path)
+            build_record['outputs'].append(output_image_path)
+
+        info = _image_info(src_path, digest)
+        if info is None:
+            # Pillow is missing: publish the copy but skip sizes
+            continue
+        job['info'] = info
+        if 'error' in info:
+            print(f"Warning: Could not process image {src}: {info['error']}")
+            continue
+        width, height = info['size']
+        if 'width' not in img.attrs and 'height' not in img.attrs:
+            img['width'], img['height'] = str(width), str(height)
+
+        # Generate a few standard responsive widths. Always include the original width.
+        target_widths = sorted(set([w for w in _RESPONSIVE_WIDTHS if w < width] + [width]))
+        if os.path.splitext(src_path)[1].lower() not in _MODERN_IMAGE_SOURCES:
+            formats = []
+        else:
+            formats = modern_formats
+        sizes = '(max-width: 900px) 100vw, 900px'
+
+        def srcset(format_suffix='', quality=None):
+            """Queue the variants of one format and return their srcset."""
+            parts = []
+            for w in target_widths:
+                if w == width and not format_suffix:
+                    entry_rel = new_src
+                else:
+                    variant_path = _image_variant_path(output_image_path, w if w != width else None, format_suffix)
+                    entry_rel = os.path.relpath(variant_path, page_output_dir).replace(os.sep, '/')
+                    job['variants'].append((w if w != width else None, format_suffix, quality))
+                    if build_record is not None:
+                        build_record['outputs'].append(variant_path)
+                parts.append(f"{entry_rel} {w}w" if len(target_widths) > 1 else entry_rel)
+            return ', '.join(parts)
+
+        if len(target_widths) > 1:
+            img['srcset'] = srcset()
+            img['sizes'] = sizes
+        if formats and not (img.parent and img.parent.name == 'picture'):
+            # Typed <source>s, best format first; the <img> stays the
+            # fallback and keeps its attributes
+            picture = soup.new_tag('picture')
+            img.wrap(picture)
+            for format_suffix, mime, quality in formats:
+                source = soup.new_tag('source', attrs={'type': mime, 'srcset': srcset(format_suffix, quality)})
+                if len(target_widths) > 1:
+                    source['sizes'] = sizes
+                img.insert_before(source)
+
+    if build_record is None:
+        generate_images(image_jobs)
+
+def _generate_image_task(task):
+    """Publish one source image: copy the original and write the variants
+    in task['variants'], (width or None, format suffix, quality) each.
+    Returns the paths written."""
+    written = []
+    src_path, output_image_path = task['source'], task['output']
+    os.makedirs(os.path.dirname(output_image_path), exist_ok=True)
+    if task['copy']:
+        _write_atomically(output_image_path, lambda tmp: shutil.copy2(src_path, tmp))
+        written.append(output_image_path)
+    if task['variants']:
+        from PIL import Image
+        with Image.open(src_path) as im:
+            width, height = im.size
+            for w, format_suffix, quality in task['variants']:
+                variant = im if not w else im.resize((w, max(1, int(height * w / width))), Image.LANCZOS)
+                path = _image_variant_path(output_image_path, w, format_suffix)
+                if format_suffix:
+                    if variant.mode not in ('RGB', 'RGBA'):
+                        variant = variant.convert('RGBA' if 'A' in variant.mode or 'transparency' in variant.info else 'RGB')
+                    _write_atomically(path, lambda tmp: variant.save(tmp, quality=quality))
+                else:
+                    _write_atomically(path, variant.save)
+                written.append(path)
+    return written
+
+def generate_images(image_jobs, jobs=1):
+    """Produce the image copies and variants queued while rendering pages.
+
+    Jobs are merged per published path, so an image shared by many pages is
+    processed once. A file is skipped when it exists and the image cache
+    records it as generated from the same source content (and quality);
+    otherwise the source is opened once for all of its missing variants.
+    With jobs > 1 (0: one per CPU), sources are processed in a worker pool.
+    """
+    merged = {}
+    for job in image_jobs:
+        if job.get('info') is not None:
+            _IMAGE_CACHE['images'].setdefault(job['digest'], job['info'])
+        entry = merged.setdefault(job['output'], {"source": job['source'], "digest": job['digest'], "variants": set()})
+        entry['variants'].update(tuple(variant) for variant in job['variants'])
+
+    def token(digest, format_suffix, quality):
+        return f"{digest}:{quality}" if format_suffix else digest
+
+    def is_current(path, expected):
+        rel = os.path.relpath(path, OUTPUT_DIR).replace(os.sep, '/')
+        return os.path.exists(path) and _IMAGE_CACHE['outputs'].get(rel) == expected
+
+    tasks = []
+    for output_image_path, entry in sorted(merged.items()):
+        digest = entry['digest']
+        task = {
+            "source": entry['source'],
+            "digest": digest,
+            "output": output_image_path,
+            "copy": not is_current(output_image_path, digest),
+            "variants": [list(v) for v in sorted(entry['variants'], key=lambda v: (v[0] or 0, v[1]))
+                         if not is_current(_image_variant_path(output_image_path, v[0], v[1]), token(digest, *v[1:]))],
+        }
+        if task['copy'] or task['variants']:
+            tasks.append(task)
+    if not tasks:
+        return
 
-        try:
-            if Image is None:
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, len(tasks))
+
+    def run(task_results):
+        for task, result in task_results:
+            if isinstance(result, Exception):
+                print(f"Warning: Could not process image {task['source']}: {result}")
                 continue
-            with Image.open(src_path) as im:
-                width, height = im.size
-                if 'width' not in img.attrs and 'height' not in img.attrs:
-                    img['width'], img['height'] = str(width), str(height)
-
-                # Generate a few standard responsive widths. Always include the original width.
-                target_widths = sorted(set([w for w in (480, 800, 1200, 1600) if w < width] + [width]))
-                if len(target_widths) <= 1:
-                    # Image is small enough that extra sizes don't help
-                    continue
+            qualities = {_image_variant_path(task['output'], *v[:2]): token(task['digest'], *v[1:])
+                         for v in task['variants']}
+            for path in result:
+                rel = os.path.relpath(path, OUTPUT_DIR).replace(os.sep, '/')
+                _IMAGE_CACHE['outputs'][rel] = qualities.get(path, task['digest'])
 
-                srcset_parts = []
-                for w in target_widths:
-                    if w == width:
-                        entry_rel = new_src
-                    else:
-                        name, ext = os.path.splitext(output_image_path)
-                        scaled_path = f"{name}-{w}w{ext}"
-                        entry_rel = os.path.relpath(scaled_path, page_output_dir).replace(os.sep, '/')
-                        if not os.path.exists(scaled_path) or os.path.getmtime(src_path) > os.path.getmtime(scaled_path):
-                            ratio = w / width
-                            h = max(1, int(height * ratio))
-                            im_resized = im.resize((w, h), Image.LANCZOS)
-                            im_resized.save(scaled_path)
-                    srcset_parts.append(f"{entry_rel} {w}w")
-
-                img['srcset'] = ', '.join(srcset_parts)
-                img['sizes'] = '(max-width: 900px) 100vw, 900px'
+    def attempt(task):
+        try:
+            return _generate_image_task(task)
         except Exception as e:
-            print(f"Warning: Could not process image {src}: {e}")
+            return e
+
+    if jobs <= 1:
+        run((task, attempt(task)) for task in tasks)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [(task, pool.submit(_generate_image_task, task)) for task in tasks]
+            run((task, future.exception() or future.result()) for task, future in futures)
 
 def remove_frontmatter(md_text):
     """Removes frontmatter from markdown text."""
@@ -1665,207 +2537,335 @@ def remove_frontmatter(md_text):
             return parts[2].strip()
     return md_text
 
+class _TextExtractor(HTMLParser):
+    """Collect the text nodes of an HTML fragment, skipping script/style."""
+
+    _SKIP = {'script', 'style', 'template'}
+
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+        self._skipping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self._SKIP:
+            self._skipping += 1
+
+    def handle_endtag(self, tag):
+        if tag in self._SKIP and self._skipping:
+            self._skipping -= 1
+
+    def handle_data(self, data):
+        if not self._skipping:
+            self.parts.append(data)
+
+    def unknown_decl(self, data):
+        if data.startswith('CDATA[') and not self._skipping:
+            self.parts.append(data[len('CDATA['):])
+
+def _html_to_text(html):
+    """Plain text of an HTML fragment, text nodes joined with spaces."""
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    return ' '.join(parser.parts).strip()
+
+SEARCH_DIR = "search"
+_SEARCH_SHARD_BYTES = 64 * 1024
+_SEARCH_TEXT_BYTES = 128 * 1024
+_SEARCH_TOKEN_RE = re.compile(r'\w+')
+# Weight of a term occurrence in each field when search.js ranks pages
+_SEARCH_FIELD_BOOSTS = {"title": 5, "body": 1}
+# Page Markdown digest -> (text length, body terms, their counts, body length)
+_SEARCH_TEXT_CACHE = {}
+_SEARCH_TEXT_SHARDS = {}  # text shard name -> digests of the pages it holds, in order
+# Both persist in the output directory, so a build in a new process only
+# analyses the pages whose Markdown changed
+SEARCH_CACHE_NAME = ".wingtip-search.json"
+_SEARCH_CACHE_VERSION = 1
+
+def _search_tokens(text):
+    """Lowercased word tokens; search.js tokenizes queries the same way."""
+    return _SEARCH_TOKEN_RE.findall(text.lower())
+
+def _compact_json(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+def _search_shard_stem(key):
+    """Filesystem-safe stem for a term-prefix shard key."""
+    if re.fullmatch(r'[a-z0-9_]+', key):
+        return key
+    return 'u' + '-'.join(f'{ord(c):x}' for c in key)
+
+def _search_analysis(content_md):
+    """(search text, analysis) of a page's Markdown, where the analysis is
+    its _SEARCH_TEXT_CACHE entry. Terms are interned, so a word shared by
+    many pages is stored once."""
+    # Strip HTML tags to get plain text (a full soup tree is not needed just
+    # to read the text nodes back out)
+    text = _html_to_text(_markdown_engine('search').reset().convert(content_md))
+    counts = Counter(_search_tokens(text))
+    return text, (len(text), tuple(map(sys.intern, counts)), tuple(counts.values()), sum(counts.values()))
+
+def _previous_search_texts(search_dir, digests):
+    """Text of the pages with these Markdown digests, read back from the
+    text shards the last build wrote, by digest; pages not found there are
+    left out."""
+    wanted = set(digests)
+    found = {}
+    for name, held in _SEARCH_TEXT_SHARDS.items():
+        if wanted.isdisjoint(held):
+            continue
+        try:
+            texts = json.loads(pathlib.Path(search_dir, name).read_text(encoding='utf8'))
+        except (OSError, ValueError):
+            continue
+        if isinstance(texts, list) and len(texts) == len(held):
+            found.update((digest, text) for digest, text in zip(held, texts) if digest in wanted)
+    return found
+
+def _load_search_cache(output_dir):
+    """Seed the search analysis from the last build into output_dir, when
+    this process has none of its own (a CLI build, or a dev server's first)."""
+    if _SEARCH_TEXT_CACHE or _SEARCH_TEXT_SHARDS:
+        return
+    path = os.path.join(output_dir, SEARCH_CACHE_NAME)
+    if not os.path.exists(path):
+        return
+    try:
+        cached = json.loads(pathlib.Path(path).read_text(encoding='utf8'))
+        # Text extraction is part of the generator, so a new one starts over
+        if cached.get('version') != _SEARCH_CACHE_VERSION or cached.get('engine') != _file_digest(__file__):
+            return
+        for digest, (text_length, body_length, terms, counts) in cached['pages'].items():
+            _SEARCH_TEXT_CACHE[digest] = (text_length, tuple(map(sys.intern, terms.split())), tuple(counts),
+                                          body_length)
+        _SEARCH_TEXT_SHARDS.update((name, tuple(digests)) for name, digests in cached['text'].items())
+    except Exception:
+        _SEARCH_TEXT_CACHE.clear()
+        _SEARCH_TEXT_SHARDS.clear()
+
+def _write_search_cache(output_dir):
+    """Persist the search analysis of this build's pages: per page, its
+    text length, body length, terms (space-separated) and their counts."""
+    cache = {
+        "version": _SEARCH_CACHE_VERSION,
+        "engine": _file_digest(__file__),
+        "pages": {digest: [text_length, body_length, ' '.join(terms), counts]
+                  for digest, (text_length, terms, counts, body_length) in _SEARCH_TEXT_CACHE.items()},
+        "text": _SEARCH_TEXT_SHARDS,
+    }
+    path = os.path.join(output_dir, SEARCH_CACHE_NAME)
+    pathlib.Path(path).write_text(_compact_json(cache), encoding='utf8')
+
+def _write_search_file(search_dir, stem, data):
+    """Write a content-addressed shard (skipped if already on disk); returns
+    its site-root-relative path. Shards are recorded as artifacts, so the
+    ones a later build no longer writes are removed by cleanup_output_dir."""
+    payload = _compact_json(data)
+    name = f"{stem}.{_digest(payload)[:10]}.json"
+    path = os.path.join(search_dir, name)
+    if not os.path.exists(path):
+        with open(path, "w", encoding="utf8") as f:
+            f.write(payload)
+    _emit_artifact(path)
+    return f"{SEARCH_DIR}/{name}"
+
 def generate_search_index(pages_data, output_dir):
-    """Generates search_index.json from pages data."""
-    search_index = []
-    for page_item in pages_data:
+    """Generates the sharded search index.
+
+    search_index.json is a small minified manifest: each page's title, URL
+    and boosted length, the field boosts, the term shard for every term
+    prefix, and the text shard holding each run of pages. Term shards
+    (search/<prefix>.<digest>.json) form an inverted index: each term maps
+    to flat [page id, title tf, body tf, ...] postings, which search.js
+    ranks with BM25. Text shards carry page text for result snippets, so
+    the full text stays out of the files a query has to load. Shard names
+    carry a content digest: clients never mix shards from different
+    builds, and unchanged shards are not rewritten.
+    """
+    pages = []
+    lengths = []
+    postings = {}
+    analyses = {}
+    search_dir = os.path.join(output_dir, SEARCH_DIR)
+    os.makedirs(search_dir, exist_ok=True)
+    _load_search_cache(output_dir)
+    analysed_now = 0
+
+    # Page text goes to disk a shard at a time as pages are analysed; per
+    # page, only the compact term counts outlive the loop. A shard holding
+    # the same unchanged pages as last time is kept as it is, and pages
+    # analysed by an earlier build get their text back from its shards.
+    text_files = []
+    text_shards = {}
+    reusable = {(name.split('.')[0], held): name for name, held in _SEARCH_TEXT_SHARDS.items()}
+    chunk, chunk_start, chunk_bytes = [], 0, 0
+
+    def write_text_shard():
+        stem = f"text-{chunk_start}"
+        digests = tuple(digest for digest, _, _ in chunk)
+        name = reusable.get((stem, digests))
+        if name and os.path.exists(os.path.join(search_dir, name)):
+            _emit_artifact(os.path.join(search_dir, name))
+        else:
+            texts = {digest: text for digest, _, text in chunk if text is not None}
+            texts.update(_previous_search_texts(search_dir, [d for d in digests if d not in texts]))
+            for digest, content_md, _ in chunk:
+                if digest not in texts:
+                    texts[digest] = _search_analysis(content_md)[0]
+            name = posixpath.basename(_write_search_file(search_dir, stem, [texts[d] for d in digests]))
+        text_shards[name] = digests
+        text_files.append([chunk_start, f"{SEARCH_DIR}/{name}"])
+
+    for page_id, page_item in enumerate(pages_data):
         title = page_item["title"]
         content_md = page_item["content_md"]
         url = page_item["url"]
 
-        # Convert markdown to HTML
-        html_content = markdown.markdown(content_md, extensions=_gfm_extensions())
-
-        # Strip HTML tags to get plain text
-        soup = BeautifulSoup(html_content, "html.parser")
-        text_content = soup.get_text(separator=' ').strip()
+        digest = _digest(content_md)
+        analysed = analyses.get(digest) or _SEARCH_TEXT_CACHE.get(digest)
+        text_content = None
+        if analysed is None:
+            text_content, analysed = _search_analysis(content_md)
+            analysed_now += 1
+        analyses[digest] = analysed
+        text_length, body_terms, body_counts, body_length = analysed
 
         # Ensure URL is absolute by prepending base_url if needed
         if not url.startswith(('http://', 'https://', '/')):
             url = f"{BASE_URL}/{url}"
 
-        search_index.append({
-            "title": title,
-            "text": text_content,
-            "url": url
-        })
+        pages.append([title, url])
+
+        title_tokens = _search_tokens(title)
+        title_tf = Counter(title_tokens)
+        lengths.append(_SEARCH_FIELD_BOOSTS["title"] * len(title_tokens) + _SEARCH_FIELD_BOOSTS["body"] * body_length)
+        for term, count in zip(body_terms, body_counts):
+            postings.setdefault(term, []).extend((page_id, title_tf.pop(term, 0), count))
+        for term, count in title_tf.items():
+            postings.setdefault(sys.intern(term), []).extend((page_id, count, 0))
+
+        chunk.append((digest, content_md, text_content))
+        chunk_bytes += text_length
+        if chunk_bytes >= _SEARCH_TEXT_BYTES or page_id == len(pages_data) - 1:
+            write_text_shard()
+            chunk, chunk_start, chunk_bytes = [], page_id + 1, 0
+
+    # Keep only this build's pages: later builds convert just the pages
+    # whose Markdown changed
+    unchanged = (not analysed_now and analyses.keys() == _SEARCH_TEXT_CACHE.keys()
+                 and text_shards == _SEARCH_TEXT_SHARDS)
+    _SEARCH_TEXT_CACHE.clear()
+    _SEARCH_TEXT_CACHE.update(analyses)
+    _SEARCH_TEXT_SHARDS.clear()
+    _SEARCH_TEXT_SHARDS.update(text_shards)
+    if not (unchanged and os.path.exists(os.path.join(output_dir, SEARCH_CACHE_NAME))):
+        _write_search_cache(output_dir)
+
+    # Group terms by first character; split a group by its first two
+    # characters when it would make a large shard.
+    groups = {}
+    for term in sorted(postings):
+        groups.setdefault(term[0], {})[term] = postings[term]
+    shards = {}
+    for key, terms in groups.items():
+        if len(_compact_json(terms)) <= _SEARCH_SHARD_BYTES:
+            shards[key] = terms
+            continue
+        for term, entries in terms.items():
+            shards.setdefault(term[:2], {})[term] = entries
 
-    output_path = os.path.join(output_dir, "search_index.json")
-    os.makedirs(output_dir, exist_ok=True)
-    with open(output_path, "w", encoding="utf8") as f:
-        json.dump(search_index, f, indent=2)
-    print(f"Generated search index: {output_path}")
+    term_files = {
+        key: _write_search_file(search_dir, _search_shard_stem(key), terms)
+        for key, terms in sorted(shards.items())
+    }
 
-def convert_markdown_file(input_path, output_filename, add_edit_link=False, prev_page=None, next_page=None):
-    with open(input_path, "r", encoding="utf8") as f:
-        md = f.read()
-    
-    front_matter = parse_frontmatter(md)
-    md = remove_frontmatter(md)
+    manifest = {
+        "version": 2,
+        "pages": pages,
+        "lengths": lengths,
+        "boosts": _SEARCH_FIELD_BOOSTS,
+        "terms": term_files,
+        "text": text_files,
+    }
+    output_path = _emit_artifact(os.path.join(output_dir, "search_index.json"))
+    with open(output_path, "w", encoding="utf8") as f:
+        f.write(_compact_json(manifest))
+    print(f"Generated search index: {output_path} ({len(term_files)} term shard(s))")
+
+def convert_markdown_file(input_path, output_filename, add_edit_link=False, prev_page=None, next_page=None,
+                          build_record=None):
+    # With --profile, build_record carries the page's phase and plugin timings
+    timings = build_record.get('timings') if build_record is not None else None
+    clock = time.perf_counter()
+    source = load_source(input_path)
+    # Plugins may mutate front matter in place; keep the shared copy intact.
+    front_matter = copy.deepcopy(source['front'])
+    md = source['body']
+    clock = _phase_done(timings, 'markdown', clock)
 
     # Plugin before_convert hooks
     for plugin in _PLUGINS:
         hook = getattr(plugin, 'before_convert', None)
         if callable(hook):
             try:
-                result = hook(front_matter, md, input_path, output_filename)
+                with _plugin_timer(timings and timings['plugins'], plugin, 'before_convert'):
+                    result = hook(front_matter, md, input_path, output_filename)
                 if isinstance(result, tuple) and len(result) == 2:
                     front_matter, md = result
                 elif result is not None:
                     md = str(result)
             except Exception as e:
                 print(f"Warning: before_convert hook failed in {plugin.__name__}: {e}")
+    clock = _phase_done(timings, 'plugins', clock)
 
-    # Create a custom link pattern processor
-    class LinkRewriter(markdown.treeprocessors.Treeprocessor):
-        def __init__(self, *args, **kwargs):
-            super().__init__(*args, **kwargs)
-            # Load external link config
-            self.config = self.load_config()
-
-        def load_config(self):
-            """External link configuration, defaulting when no config.json exists.
-
-            Reads the already-parsed CONFIG rather than re-opening config.json
-            off disk -- the old version warned twice per build for every user
-            without a config file, which is the documented zero-config path.
-            """
-            defaults = {
-                'open_in_new_tab': True,
-                'exclude_domains': [],
-                'include_domains': [],
-                'exclude_paths': [],
-                'attributes': {
-                    'rel': 'noopener noreferrer',
-                    'class': 'external-link'
-                }
-            }
-            overrides = CONFIG.get('external_links')
-            if not isinstance(overrides, dict):
-                return defaults
-            merged = defaults.copy()
-            merged.update(overrides)
-            return merged
-
-        def is_external_link(self, href):
-            """Check if a URL is external (starts with http:// or https://)"""
-            return href and href.startswith(('http://', 'https://'))
-
-        def should_open_in_new_tab(self, href):
-            """Determine if a link should open in a new tab based on config rules"""
-            if not self.is_external_link(href):
-                return False
-
-            # Extract domain from href
-            from urllib.parse import urlparse
-            domain = urlparse(href).netloc
-
-            # Check exclude_domains
-            if any(domain.endswith(d) for d in self.config.get('exclude_domains', [])):
-                return False
-
-            # Check include_domains
-            if any(domain.endswith(d) for d in self.config.get('include_domains', [])):
-                return True
-
-            # Check exclude_paths
-            path = urlparse(href).path
-            if any(fnmatch.fnmatch(path, pattern) for pattern in self.config.get('exclude_paths', [])):
-                return False
-
-            # Use global setting
-            return self.config.get('open_in_new_tab', True)
-
-        def run(self, root):
-            for element in root.iter('a'):
-                href = element.get('href')
-                if not href:
-                    continue
-
-                if self.is_external_link(href):
-                    # Handle external link according to config
-                    if self.should_open_in_new_tab(href):
-                        element.set('target', '_blank')
-                        # Add additional attributes from config
-                        for key, value in self.config.get('attributes', {}).items():
-                            element.set(key, value)
-                else:
-                    # Handle internal link rewriting
-                    if href.startswith(('#', '/')):
-                        continue
-
-                    # Handle .md extension conversion (including fragment/query variants)
-                    base, sep, rest = href.partition('.md')
-                    if sep == '.md':
-                        suffix = rest
-                        if not suffix or suffix.startswith(('#', '?')):
-                            href = base + '.html' + suffix
-
-                    # Handle docs/ prefix for local development vs GitHub Pages.
-                    # Only strip it when the docs/-prefixed path is not itself
-                    # a real page — a project may legitimately have a docs/
-                    # directory inside its docs tree (URL space docs/...).
-                    if href.startswith('docs/'):
-                        path_only = href.split('#')[0].split('?')[0]
-                        if path_only not in _all_page_urls():
-                            href = href[5:]  # Remove docs/ prefix
-
-                    element.set('href', href)
-            return root
-    
-    class LinkRewriterExtension(markdown.Extension):
-        def extendMarkdown(self, md):
-            md.treeprocessors.register(LinkRewriter(md), 'link_rewriter', 7)
-    
     # Convert markdown to HTML with link rewriting, GFM features, and plugin extensions
-    plugin_extensions = _plugin_markdown_extensions(_PLUGINS)
-    html = markdown.markdown(
-        md,
-        extensions=[
-            "codehilite",
-            "nl2br",           # Newlines to <br>
-            "sane_lists",     # Better list handling
-            "smarty",         # Smart quotes, dashes, etc
-            "attr_list",     # {: .class} style attributes
-            "md_in_html",    # Markdown inside HTML
-            "toc",           # [TOC] generation
-            LinkRewriterExtension(),
-            "wingtip.latex_extension"
-        ] + _gfm_extensions() + plugin_extensions,
-        output_format="html5"
-    )
-    
+    html = _markdown_engine('page').reset().convert(md)
+
     # Replace LaTeX placeholders with actual delimiters
     html = html.replace('DISPLAYMATH_START', '\\[')
     html = html.replace('DISPLAYMATH_END', '\\]')
     html = html.replace('INLINEMATH_START', '\\(')
     html = html.replace('INLINEMATH_END', '\\)')
+    clock = _phase_done(timings, 'markdown', clock)
+
+    # Parse once; copy buttons, table wrapping and image optimization all
+    # work on the same tree
+    soup = BeautifulSoup(html, 'html.parser')
 
     # Add copy buttons to code blocks
-    html = add_codeblock_copy_buttons(html)
+    _add_codeblock_copy_buttons(soup)
 
     # Wrap all tables in a responsive div
-    soup = BeautifulSoup(html, 'html.parser')
     for table in soup.find_all('table'):
         wrapper = soup.new_tag('div', attrs={'class': 'table-responsive'})
         table.insert_before(wrapper)
         wrapper.append(table)
 
+    clock = _phase_done(timings, 'soup', clock)
+
     # Optimize content images: copy to output, generate responsive srcset, lazy load
-    _process_content_images(soup, input_path, output_filename)
+    _process_content_images(soup, input_path, output_filename, build_record=build_record)
+    clock = _phase_done(timings, 'images', clock)
 
     # Plugin after_convert hooks (operate on fully processed HTML)
-    html = str(soup)
+    html = processed_html = str(soup)
+    clock = _phase_done(timings, 'soup', clock)
     for plugin in _PLUGINS:
         hook = getattr(plugin, 'after_convert', None)
         if callable(hook):
             try:
-                result = hook(html, front_matter, input_path, output_filename)
+                with _plugin_timer(timings and timings['plugins'], plugin, 'after_convert'):
+                    result = hook(html, front_matter, input_path, output_filename)
                 if isinstance(result, str):
                     html = result
             except Exception as e:
                 print(f"Warning: after_convert hook failed in {plugin.__name__}: {e}")
-    soup = BeautifulSoup(html, 'html.parser')
+    clock = _phase_done(timings, 'plugins', clock)
+    # Only re-parse when a hook actually rewrote the HTML
+    if html != processed_html:
+        soup = BeautifulSoup(html, 'html.parser')
 
     h1 = soup.find('h1')
     title = str(front_matter.get('title') or (h1.text if h1 else os.path.basename(input_path))).strip()
@@ -1895,6 +2895,8 @@ def convert_markdown_file(input_path, output_filename, add_edit_link=False, prev
     else:
         page_root = BASE_URL
 
+    clock = _phase_done(timings, 'soup', clock)
+
     # Get navigation links (keyed on the output path, so synthesized pages
     # like section hubs get correct depth-relative links)
     nav_links = build_navigation(rel_out)
@@ -1902,6 +2904,7 @@ def convert_markdown_file(input_path, output_filename, add_edit_link=False, prev
     # Build prev/next links (relative to this page's directory)
     prev_link = f'<a href="{_rel_href(rel_out, prev_page[1])}" class="prev">← {prev_page[0]}</a>' if prev_page else ''
     next_link = f'<a href="{_rel_href(rel_out, next_page[1])}" class="next">{next_page[0]} →</a>' if next_page else ''
+    clock = _phase_done(timings, 'navigation', clock)
 
     # Add edit on GitHub link if requested
     if add_edit_link and CONFIG.get("github", {}).get("repo"):
@@ -1970,15 +2973,14 @@ def convert_markdown_file(input_path, output_filename, add_edit_link=False, prev
     else:
         csp_meta = ''
 
-    # Determine raw markdown content to pass to template. Read it for every
-    # page — the .html.md sibling the template links to must exist even on
-    # pages without an edit link (the 404 page shipped a dead alternate).
-    raw_markdown_for_template = ""
-    try:
-        with open(input_path, 'r', encoding='utf8') as f:
-            raw_markdown_for_template = f.read()
-    except Exception as e:
-        print(f"Warning: Could not read raw markdown from {input_path}: {e}")
+    # Raw markdown for the .html.md sibling, written for every page — the
+    # alternate the template links to must exist even on pages without an
+    # edit link (the 404 page shipped a dead alternate). The view/copy
+    # buttons fetch that sibling on demand; `inline_markdown_source: true`
+    # embeds the source in the page instead, as older versions did.
+    raw_markdown = source['raw']
+    inline_markdown = raw_markdown if CONFIG.get('inline_markdown_source') else ''
+    markdown_source_href = rel_out.rpartition('/')[2] + '.md'
 
     # Generate custom theme CSS
     custom_theme_variables_style = generate_theme_css(THEME_CONFIG)
@@ -2139,9 +3141,11 @@ def convert_markdown_file(input_path, output_filename, add_edit_link=False, prev
     # Properly construct the markdown alternate URL to avoid .md extension applied to the root domain
     markdown_alternate_url = f"{page_root}/{rel_out}.md"
 
+    clock = _phase_done(timings, 'template', clock)
     breadcrumbs_html = build_breadcrumbs(rel_out, title, category, page_root)
+    clock = _phase_done(timings, 'navigation', clock)
 
-    page = TEMPLATE.substitute(
+    page = _page_template().substitute(
         title=title,
         canonical_url=canonical_url,
         page_url=page_url,
@@ -2189,20 +3193,28 @@ def convert_markdown_file(input_path, output_filename, add_edit_link=False, prev
         csp_meta=csp_meta,
         hreflang_alternates=hreflang_alternates,
         page_relative_root=page_relative_root,
-        raw_markdown_content=raw_markdown_for_template,
+        raw_markdown_content=inline_markdown,
+        markdown_source_href=html_module.escape(markdown_source_href),
         custom_theme_variables_style=custom_theme_variables_style,
         json_ld=json_ld_script
     )
+    clock = _phase_done(timings, 'template', clock)
 
     os.makedirs(os.path.dirname(output_filename), exist_ok=True)
     with open(output_filename, "w", encoding="utf8") as f:
         f.write(page)
 
     # Write the markdown sibling file (.html.md)
-    if raw_markdown_for_template:
+    if raw_markdown:
         md_sibling_path = output_filename + ".md"
         with open(md_sibling_path, "w", encoding="utf8") as f:
-            f.write(raw_markdown_for_template)
+            f.write(raw_markdown)
+
+    if build_record is not None:
+        build_record['outputs'].append(output_filename)
+        if raw_markdown:
+            build_record['outputs'].append(output_filename + ".md")
+    _phase_done(timings, 'write', clock)
 
     return front_matter
 
@@ -2225,66 +3237,604 @@ def _front_is_noindex(front):
 def generate_concatenated_markdown():
     """Generates a single Markdown file from README.md and docs/*.md
     (excluding 404.md and noindex pages)."""
-    all_markdown_content = []
-    files_to_process = []
-
-    # Add README.md if it exists
-    if os.path.exists("README.md"):
-        files_to_process.append("README.md")
-
-    # Add files from docs/ recursively, excluding 404.md
-    for md_path in _discover_doc_files("docs"):
-        if os.path.basename(md_path) != "404.md":
-            files_to_process.append(md_path)
-
-    for filepath in files_to_process:
-        try:
-            with open(filepath, "r", encoding="utf8") as f:
-                content = f.read()
-            if _front_is_noindex(parse_frontmatter(content)):
-                continue
-            all_markdown_content.append(f"\n---\nFile: {filepath}\n---\n\n{content}")
-        except Exception as e:
-            print(f"Warning: Could not read or process file {filepath}: {e}")
-
-    if not all_markdown_content:
+    # README.md and docs/ recursively, excluding 404.md
+    docs = [
+        doc for doc in _source_corpus("docs")
+        if not (doc['path'] != "README.md" and os.path.basename(doc['path']) == "404.md") and not doc['noindex']
+    ]
+    if not docs:
         print("No Markdown files found to concatenate.")
         return
 
-    concatenated_content = "".join(all_markdown_content)
-
     output_filename = CONFIG.get("concat_docs_filename", "llms-full.txt")
     full_output_path = os.path.join(OUTPUT_DIR, output_filename)
 
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     try:
-        with open(full_output_path, "w", encoding="utf8") as f:
-            f.write(concatenated_content)
+        # Written a document at a time from the loaded sources; the
+        # concatenation never exists in memory
+        with _streamed_output(_emit_artifact(full_output_path)) as write:
+            for doc in docs:
+                write(f"\n---\nFile: {doc['path']}\n---\n\n")
+                write(doc['raw'])
         print(f"Generated concatenated docs: {full_output_path}")
     except Exception as e:
         print(f"Error writing concatenated Markdown file: {e}")
 
-def cleanup_output_dir(generated_files):
-    """Remove files in OUTPUT_DIR that are not in the list of generated files.
-    Only removes .html files to avoid touching assets, images, etc."""
-    for root, _, files in os.walk(OUTPUT_DIR):
-        for file in files:
-            if file.endswith('.html'):
-                full_path = os.path.join(root, file)
-                if full_path not in generated_files:
+BUILD_MANIFEST_NAME = ".wingtip-manifest.json"
+_BUILD_MANIFEST_VERSION = 1
+_file_digest_cache = {}
+# Site-level files this build wrote, relative to OUTPUT_DIR. Together with
+# the pages' outputs they are the manifest's "artifacts", which the next
+# build's cleanup diffs against.
+_ARTIFACTS = set()
+
+def _emit_artifact(path):
+    """Record path (under OUTPUT_DIR) as written by this build; returns path."""
+    _ARTIFACTS.add(_relpath(path, OUTPUT_DIR).replace(os.sep, '/'))
+    return path
+
+def _digest(data):
+    """sha256 hex digest of bytes or str."""
+    if isinstance(data, str):
+        data = data.encode('utf8')
+    return hashlib.sha256(data).hexdigest()
+
+def _file_digest(path):
+    """Content hash of a file, cached until it changes; None when unreadable."""
+    stamp = _file_stamp(path)
+    cached = _file_digest_cache.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    try:
+        # Hashed in blocks: output files such as llms-full.txt can be large
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                sha.update(block)
+        digest = sha.hexdigest()
+    except OSError:
+        digest = None
+    _file_digest_cache[path] = (stamp, digest)
+    return digest
+
+@contextlib.contextmanager
+def _streamed_output(path):
+    """Write a large artifact piece by piece: yields a write(str) function.
+
+    Pieces go straight to a temporary file while their digest is taken;
+    the file replaces path only when its content changed, so an unchanged
+    artifact keeps its mtime (and its precompressed siblings).
+    """
+    tmp_path = f"{path}.tmp"
+    sha = hashlib.sha256()
+    try:
+        with open(tmp_path, 'w', encoding='utf8') as f:
+            def write(text):
+                f.write(text)
+                sha.update(text.encode('utf8'))
+            yield write
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+    if os.path.exists(path) and _file_digest(path) == sha.hexdigest():
+        os.remove(tmp_path)
+    else:
+        os.replace(tmp_path, path)
+
+def _build_fingerprint():
+    """Digest of every input that all pages share.
+
+    Covers config.json and theme.json (as parsed and normalised), the page
+    template, loaded plugin sources, the generator itself, and the rendered
+    sidebar -- the sidebar lists every page title and group, so any change
+    to it touches every page. Output-side assets the template links only
+    when they exist (favicon, PWA icons) are included too, otherwise the
+    first incremental build after they appear would keep pages without them.
+    """
+    head_snippets = [
+        _file_digest(CONFIG[key]) for key in ('head_snippet', 'head')
+        if isinstance(CONFIG.get(key), str) and os.path.exists(CONFIG[key])
+    ]
+    state = {
+        "wingtip": _package_version(),
+        "engine": _file_digest(__file__),
+        "config": CONFIG,
+        "theme": THEME_CONFIG,
+        "template": _digest(TEMPLATE.template),
+        "assets": _ASSET_MAP,
+        "plugins": [(p.__name__, _file_digest(getattr(p, '__file__', '') or '')) for p in _PLUGINS],
+        "head_snippets": head_snippets,
+        "year": datetime.now().year,
+        "output_assets": [name for name in ('favicon.png', 'icon-192.png', 'icon-512.png')
+                          if os.path.exists(os.path.join(OUTPUT_DIR, name))],
+        "navigation": _digest(build_navigation('index.html')),
+        "page_urls": sorted(_all_page_urls()),
+    }
+    return _digest(json.dumps(state, sort_keys=True, default=str))
+
+def _page_build_key(fingerprint, md_path, html_file, add_edit_link, prev_page, next_page):
+    """Digest of everything a single rendered page depends on."""
+    state = [fingerprint, _digest(load_source(md_path)['raw']), html_file, bool(add_edit_link),
+             list(prev_page) if prev_page else None, list(next_page) if next_page else None,
+             get_last_modified(md_path)]
+    return _digest(json.dumps(state, default=str))
+
+def _load_build_manifest(output_dir):
+    """Read the previous build's manifest, or {} when absent or unusable."""
+    path = os.path.join(output_dir, BUILD_MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    try:
+        manifest = json.loads(pathlib.Path(path).read_text(encoding='utf8'))
+    except Exception as e:
+        print(f"Warning: Ignoring unreadable build manifest {path}: {e}")
+        return {}
+    if not isinstance(manifest, dict) or manifest.get('version') != _BUILD_MANIFEST_VERSION:
+        return {}
+    return manifest
+
+def _write_build_manifest(output_dir, fingerprint, pages, artifacts=()):
+    """Persist per-page build keys so the next build can skip unchanged
+    pages, and every file the build wrote so the next one can remove those
+    it no longer writes."""
+    manifest = {
+        "version": _BUILD_MANIFEST_VERSION,
+        "fingerprint": fingerprint,
+        "pages": pages,
+        "artifacts": sorted(artifacts),
+    }
+    path = os.path.join(output_dir, BUILD_MANIFEST_NAME)
+    pathlib.Path(path).write_text(json.dumps(manifest, sort_keys=True), encoding='utf8')
+
+def _page_is_current(entry, key):
+    """True when a manifest entry matches key and its outputs (relative to
+    OUTPUT_DIR) and extra inputs such as images are intact."""
+    if not entry or entry.get('key') != key:
+        return False
+    if not all(os.path.exists(os.path.join(OUTPUT_DIR, rel)) for rel in entry.get('outputs', [])):
+        return False
+    return all(_file_digest(path) == digest for path, digest in entry.get('inputs', {}).items())
+
+def _page_task(md_path, html_file, fingerprint, add_edit_link=False, prev_page=None, next_page=None):
+    """Describe one page render as a picklable dict, keyed for the manifest."""
+    return {
+        "md_path": md_path,
+        "html_file": html_file,
+        "key": _page_build_key(fingerprint, md_path, html_file, add_edit_link, prev_page, next_page),
+        "add_edit_link": add_edit_link,
+        "prev_page": prev_page,
+        "next_page": next_page,
+    }
+
+def _render_page_task(task):
+    """Render one page task and return (html_file, manifest entry, image
+    jobs, profile), where profile holds the page's timings when the task
+    asks for them (--profile) and is None otherwise.
+
+    Runs in the build process for serial builds and in a pool worker for
+    `--jobs N`; everything it reads beyond the task comes from module state
+    that _init_render_worker restores.
+    """
+    html_file = task['html_file']
+    build_record = {'outputs': [], 'inputs': []}
+    profile = None
+    if task.get('profile'):
+        profile = {"page": html_file, "source": task['md_path'], "phases": {}, "plugins": {}}
+        build_record['timings'] = profile
+        started = time.perf_counter()
+    front = convert_markdown_file(task['md_path'], os.path.join(OUTPUT_DIR, html_file),
+                                  add_edit_link=task['add_edit_link'],
+                                  prev_page=task['prev_page'], next_page=task['next_page'],
+                                  build_record=build_record)
+    if profile is not None:
+        profile['seconds'] = time.perf_counter() - started
+    return html_file, {
+        "source": task['md_path'],
+        "key": task['key'],
+        "noindex": _front_is_noindex(front),
+        "outputs": sorted({os.path.relpath(path, OUTPUT_DIR).replace(os.sep, '/')
+                           for path in build_record['outputs']}),
+        "inputs": {path: _file_digest(path) for path in build_record['inputs']},
+    }, build_record.get('images', []), profile
+
+def _render_worker_state():
+    """Module state a render worker needs to produce the same page a serial
+    build would. Plugins are not included: modules don't pickle, so each
+    worker imports them itself."""
+    return {
+        "cwd": os.getcwd(),
+        "config": CONFIG,
+        "theme_config": THEME_CONFIG,
+        "base_url": BASE_URL,
+        "output_dir": OUTPUT_DIR,
+        "nav": _collect_nav_data('docs'),
+        "page_urls": _all_page_urls(),
+        "category_meta": dict(_CATEGORY_META),
+        "asset_map": dict(_ASSET_MAP),
+        "image_info": dict(_IMAGE_CACHE['images']),
+        "last_modified": dict(_last_modified_cache),
+        "git_dates": _git_dates,
+    }
+
+def _init_render_worker(state):
+    """ProcessPoolExecutor initializer: restore build state once per worker."""
+    global CONFIG, THEME_CONFIG, BASE_URL, OUTPUT_DIR, _NAV_CACHE, _PAGE_URL_CACHE, _PLUGINS, _git_dates, _PAGE_TEMPLATE
+    os.chdir(state['cwd'])
+    CONFIG = state['config']
+    THEME_CONFIG = state['theme_config']
+    BASE_URL = state['base_url']
+    OUTPUT_DIR = state['output_dir']
+    _NAV_CACHE = state['nav']
+    _PAGE_URL_CACHE = state['page_urls']
+    _CATEGORY_META.update(state['category_meta'])
+    _ASSET_MAP.clear()
+    _ASSET_MAP.update(state['asset_map'])
+    _PAGE_TEMPLATE = None
+    _IMAGE_CACHE['images'] = state['image_info']
+    _last_modified_cache.update(state['last_modified'])
+    _git_dates = state['git_dates']
+    _NAV_HTML_CACHE.clear()
+    _PLUGINS = _load_plugins()
+    _MARKDOWN_ENGINES.clear()
+
+def _parallel_unsafe_plugins():
+    """Names of loaded plugins that opt out of worker rendering."""
+    return [p.__name__ for p in _PLUGINS if getattr(p, 'parallel_safe', True) is False]
+
+def render_pages(tasks, jobs=1):
+    """Render page tasks, serially or across `jobs` worker processes.
+
+    Yields (html_file, manifest entry, image jobs, profile) in task order
+    either way, so the aggregation that follows (sitemap, feed, search) is
+    identical.
+    """
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    if jobs > 1 and _parallel_unsafe_plugins():
+        print(f"Note: rendering serially; plugin(s) {', '.join(_parallel_unsafe_plugins())} set parallel_safe = False")
+        jobs = 1
+    jobs = min(jobs, len(tasks))
+    if jobs <= 1:
+        for task in tasks:
+            yield _render_page_task(task)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    chunksize = max(1, len(tasks) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_render_worker,
+                             initargs=(_render_worker_state(),)) as pool:
+        yield from pool.map(_render_page_task, tasks, chunksize=chunksize)
+
+# Build profiling (--profile). main() marks the start of each stage, the
+# page renderer times each page's phases, and plugin hook calls are charged
+# to their plugin; the report is printed and written as JSON for CI.
+_PROFILE_SLOWEST_PAGES = 10
+
+def _plugin_name(plugin):
+    """A plugin's name as configured: its file name in plugins/."""
+    return plugin.__name__.removeprefix("__wingtip_user_plugins_")
+
+@contextlib.contextmanager
+def _plugin_timer(timings, plugin, hook_name):
+    """Charge the enclosed hook call to the plugin in timings, a
+    {plugin: {hook: seconds}} dict; a no-op when timings is None."""
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        hooks = timings.setdefault(_plugin_name(plugin), {})
+        hooks[hook_name] = hooks.get(hook_name, 0.0) + time.perf_counter() - started
+
+def _phase_done(timings, phase, started):
+    """Add the time since started to a page phase (when profiling) and
+    return the clock reading the next phase starts from."""
+    now = time.perf_counter()
+    if timings is not None:
+        phases = timings['phases']
+        phases[phase] = phases.get(phase, 0.0) + now - started
+    return now
+
+def _memory_usage():
+    """(current, peak) resident set size of the build process in bytes;
+    either is None where the platform doesn't report it."""
+    current = peak = None
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak *= 1 if sys.platform == 'darwin' else 1024  # bytes on macOS, KiB elsewhere
+    except (ImportError, OSError):
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            current = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    return current, peak
+
+def _megabytes(size):
+    return None if size is None else round(size / (1024 * 1024), 1)
+
+def _profile_stage(name):
+    """End the running build stage and, unless name is None, start the next."""
+    if _PROFILE is None:
+        return
+    now = time.perf_counter()
+    current, peak = _memory_usage()
+    running = _PROFILE['running']
+    if running:
+        stage_name, started, rss_before = running
+        _PROFILE['stages'].append({
+            "name": stage_name,
+            "seconds": round(now - started, 4),
+            "rss_mb": _megabytes(current),
+            "rss_delta_mb": _megabytes(current - rss_before) if current is not None and rss_before is not None else None,
+            "peak_rss_mb": _megabytes(peak),
+        })
+    _PROFILE['running'] = (name, now, current) if name else None
+
+def _profile_page(profile):
+    """Add one rendered page's timings to the build profile."""
+    if _PROFILE is not None and profile is not None:
+        _PROFILE['pages'].append(profile)
+
+def _write_build_profile(path):
+    """Summarize the recorded build profile, print it, and write it to path."""
+    _profile_stage(None)
+    _, peak = _memory_usage()
+    pages = sorted(_PROFILE['pages'], key=lambda page: page['seconds'], reverse=True)
+
+    phases = {}
+    plugins = {}
+    def charge(name, hook, seconds):
+        plugin = plugins.setdefault(name, {"seconds": 0.0, "hooks": {}})
+        entry = plugin['hooks'].setdefault(hook, {"calls": 0, "seconds": 0.0})
+        plugin['seconds'] += seconds
+        entry['calls'] += 1
+        entry['seconds'] += seconds
+    for page in pages:
+        for phase, seconds in page['phases'].items():
+            phases[phase] = phases.get(phase, 0.0) + seconds
+        for name, hooks in page['plugins'].items():
+            for hook, seconds in hooks.items():
+                charge(name, hook, seconds)
+    for name, hooks in _PROFILE['build_hooks'].items():
+        for hook, seconds in hooks.items():
+            charge(name, hook, seconds)
+    for plugin in plugins.values():
+        plugin['seconds'] = round(plugin['seconds'], 4)
+        for entry in plugin['hooks'].values():
+            entry['seconds'] = round(entry['seconds'], 4)
+
+    report = {
+        "version": 1,
+        "wingtip": _package_version(),
+        "total_seconds": round(time.perf_counter() - _PROFILE['started'], 4),
+        "peak_rss_mb": _megabytes(peak),
+        "jobs": _PROFILE['jobs'],
+        "pages_rendered": len(pages),
+        "pages_reused": _PROFILE['pages_reused'],
+        "stages": _PROFILE['stages'],
+        "phases": {phase: round(seconds, 4) for phase, seconds in phases.items()},
+        "plugins": dict(sorted(plugins.items(), key=lambda item: item[1]['seconds'], reverse=True)),
+        "pages": [{
+            "page": page['page'],
+            "source": page['source'],
+            "seconds": round(page['seconds'], 4),
+            "phases": {phase: round(seconds, 4) for phase, seconds in page['phases'].items()},
+            "plugins": {name: {hook: round(seconds, 4) for hook, seconds in hooks.items()}
+                        for name, hooks in page['plugins'].items()},
+        } for page in pages],
+    }
+
+    peak_note = f", peak RSS {report['peak_rss_mb']} MB" if peak is not None else ""
+    print(f"\nBuild profile ({report['total_seconds']:.2f}s{peak_note}):")
+    width = max([len(stage['name']) for stage in report['stages']] + [0])
+    for stage in report['stages']:
+        memory = f"  {stage['rss_delta_mb']:+.1f} MB" if stage['rss_delta_mb'] is not None else ""
+        print(f"  {stage['name']:<{width}}  {stage['seconds']:8.3f}s{memory}")
+    if pages:
+        print(f"Slowest pages ({len(pages)} rendered):")
+        for page in report['pages'][:_PROFILE_SLOWEST_PAGES]:
+            breakdown = ", ".join(f"{phase} {seconds:.3f}" for phase, seconds in
+                                  sorted(page['phases'].items(), key=lambda item: item[1], reverse=True)
+                                  if seconds >= 0.0005)
+            print(f"  {page['seconds']:.3f}s  {page['page']}  ({breakdown})")
+    if plugins:
+        print("Plugin hooks:")
+        for name, plugin in report['plugins'].items():
+            hooks = ", ".join(f"{hook} {entry['seconds']:.3f}s/{entry['calls']}"
+                              for hook, entry in plugin['hooks'].items())
+            print(f"  {plugin['seconds']:.3f}s  {name}  ({hooks})")
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf8') as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"Wrote build profile: {path}")
+    except OSError as e:
+        print(f"Warning: Could not write build profile {path}: {e}")
+
+_COMPRESSIBLE_EXTENSIONS = {'.html', '.md', '.txt', '.json', '.xml', '.css', '.js', '.svg', '.webmanifest'}
+_COMPRESSED_SUFFIXES = ('.gz', '.br')
+
+def _brotli_module():
+    """The brotli module if installed (optional dependency), else None."""
+    try:
+        import brotli
+        return brotli
+    except ImportError:
+        return None
+
+def _compression_settings(enabled=False):
+    """Resolve `compress` from config.json (true, or {"min_size": N, "brotli": bool})
+    and the --compress flag into (enabled, min_size, suffixes)."""
+    setting = CONFIG.get('compress', False)
+    options = setting if isinstance(setting, dict) else {}
+    enabled = enabled or bool(setting)
+    try:
+        min_size = int(options.get('min_size', 1024))
+    except (TypeError, ValueError):
+        min_size = 1024
+    suffixes = ['.gz']
+    if options.get('brotli', True) and _brotli_module():
+        suffixes.append('.br')
+    return enabled, min_size, tuple(suffixes)
+
+def _compress_file(task):
+    """Write the .gz/.br siblings of one file; returns how many were written.
+
+    A sibling at least as new as its source is current and skipped. Output
+    is deterministic (no gzip timestamp), and a sibling that would not be
+    smaller than its source is removed rather than written.
+    """
+    path, suffixes = task
+    source_mtime = os.path.getmtime(path)
+    data = None
+    written = 0
+    for suffix in suffixes:
+        sibling = path + suffix
+        if os.path.exists(sibling) and os.path.getmtime(sibling) >= source_mtime:
+            continue
+        if data is None:
+            data = pathlib.Path(path).read_bytes()
+        if suffix == '.gz':
+            payload = gzip.compress(data, compresslevel=9, mtime=0)
+        else:
+            payload = _brotli_module().compress(data, quality=11)
+        if len(payload) >= len(data):
+            if os.path.exists(sibling):
+                os.remove(sibling)
+            continue
+        _write_atomically(sibling, lambda tmp: pathlib.Path(tmp).write_bytes(payload))
+        written += 1
+    return written
+
+def compress_output(output_dir, min_size=1024, suffixes=('.gz',), jobs=1):
+    """Precompress text artifacts in output_dir into .gz/.br siblings.
+
+    Covers pages, .html.md alternates, search shards, feeds, sitemaps and
+    CSS/JS of at least min_size bytes, so a static server (nginx
+    gzip_static/brotli_static, `wingtip serve`) can send them without
+    compressing per request. Siblings of files this build wrote that no
+    longer qualify are removed; a .gz or .br file the build did not write
+    beside, such as a published archive, is left alone. Work is spread over `jobs` processes (0: one per
+    CPU).
+    """
+    tasks = []
+    eligible = set()
+    for dirpath, _, filenames in os.walk(output_dir):
+        for name in filenames:
+            if name.startswith('.') or name.endswith(_COMPRESSED_SUFFIXES):
+                continue
+            path = os.path.join(dirpath, name)
+            if os.path.splitext(name)[1].lower() in _COMPRESSIBLE_EXTENSIONS and os.path.getsize(path) >= min_size:
+                eligible.add(path)
+                tasks.append((path, suffixes))
+
+    removed = 0
+    for dirpath, _, filenames in os.walk(output_dir):
+        for name in filenames:
+            if name.endswith(_COMPRESSED_SUFFIXES):
+                path = os.path.join(dirpath, name)
+                source, suffix = os.path.splitext(path)
+                if (source not in eligible or suffix not in suffixes) and \
+                        _relpath(source, output_dir).replace(os.sep, '/') in _ARTIFACTS:
+                    os.remove(path)
+                    removed += 1
+
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, len(tasks))
+    if jobs <= 1:
+        written = sum(_compress_file(task) for task in tasks)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            written = sum(pool.map(_compress_file, tasks, chunksize=max(1, len(tasks) // (jobs * 4))))
+    print(f"Precompressed {written} file(s) ({', '.join(s.lstrip('.') for s in suffixes)}); "
+          f"{len(tasks) * len(suffixes) - written} current or incompressible"
+          + (f"; removed {removed} stale" if removed else ""))
+
+def cleanup_output_dir(artifacts, previous_artifacts=None):
+    """Remove the files the previous build wrote that this build did not.
+
+    Both arguments are sets of OUTPUT_DIR-relative paths (the manifest's
+    "artifacts"), so finding stale pages, .html.md siblings, image variants
+    and redirect pages is one set difference; files the generator never
+    wrote, such as after_build hook output, are left alone. Precompressed
+    siblings go with their file, and directories left empty are removed.
+    Without a previous list (a manifest from an older version), .html
+    files not in artifacts are removed, as before.
+    """
+    if previous_artifacts is None:
+        stale = set()
+        for root, _, files in os.walk(OUTPUT_DIR):
+            for file in files:
+                if file.endswith('.html'):
+                    rel = _relpath(os.path.join(root, file), OUTPUT_DIR).replace(os.sep, '/')
+                    if rel not in artifacts:
+                        stale.add(rel)
+    else:
+        stale = set(previous_artifacts) - artifacts
+    directories = set()
+    for rel in sorted(stale):
+        if os.path.isabs(rel) or posixpath.normpath(rel).startswith('../'):
+            continue
+        full_path = os.path.join(OUTPUT_DIR, rel)
+        for path in [full_path] + [full_path + suffix for suffix in _COMPRESSED_SUFFIXES]:
+            if os.path.isfile(path):
+                if path == full_path:
                     print(f"Removing obsolete file: {full_path}")
-                    os.remove(full_path)
+                os.remove(path)
+        directories.add(os.path.dirname(full_path))
+    for directory in sorted(directories, key=len, reverse=True):
+        while directory != OUTPUT_DIR and directory.startswith(OUTPUT_DIR + os.sep):
+            try:
+                os.rmdir(directory)
+            except OSError:
+                break
+            directory = os.path.dirname(directory)
 
-def main():
-    global _NAV_CACHE, _PAGE_URL_CACHE
+def main(argv=None):
+    """Command-line entry point; argv defaults to sys.argv[1:].
+
+    Calling it again in the same process, as the dev server does for each
+    rebuild, reuses the source caches for files that have not changed.
+    """
+    global _NAV_CACHE, _PAGE_URL_CACHE, _PAGE_TEMPLATE
+    argv = sys.argv[1:] if argv is None else list(argv)
     _NAV_CACHE = None
+    _ASSET_MAP.clear()
+    _PAGE_TEMPLATE = None
+    _NAV_HTML_CACHE.clear()
     _PAGE_URL_CACHE = None
+    _DOC_FILES_CACHE.clear()
+    _CATEGORY_META.clear()
+    _last_modified_cache.clear()
+    _FILE_STAMPS.clear()
+    _ARTIFACTS.clear()
 
     # Subcommand routing: `wingtip migrate <path>` converts an existing
     # hosted documentation project into a new WingTip project.
-    if len(sys.argv) > 1 and sys.argv[1] == "migrate":
+    if argv and argv[0] == "migrate":
         from wingtip.migrate import main as migrate_main
-        return migrate_main(sys.argv[2:])
+        return migrate_main(argv[1:])
+
+    # `wingtip serve [--static]`: the dev server, or a preview server for a
+    # finished build, with host/port options
+    if argv and argv[0] == "serve":
+        try:
+            from wingtip.serve import main as serve_main
+        except ImportError as e:
+            print(f"Could not start the server ({e}). Install it with: pip install \"wingtip[serve]\"")
+            sys.exit(1)
+        return serve_main(argv[1:])
 
     parser = argparse.ArgumentParser(
         prog="wingtip",
@@ -2293,16 +3843,33 @@ def main():
         epilog="""examples:
   wingtip
   wingtip --serve
+  wingtip serve --static --output ./build --port 8080 --workers 4
   wingtip --source ./docs-project --output ./build
+  wingtip --full --jobs 8
+  wingtip --full --profile
   wingtip migrate ./their-docs --output ./our-docs
   wingtip --regen-card""",
     )
     parser.add_argument("--regen-card", action="store_true", help="force regeneration of the Open Graph social card")
+    parser.add_argument("--full", action="store_true", help="ignore the build manifest and re-render every page")
+    parser.add_argument("--compress", action="store_true", help="write precompressed .gz (and .br, with brotli installed) siblings")
+    parser.add_argument("--jobs", "-j", type=int, default=1, metavar="N", help="render pages in N worker processes (0: one per CPU)")
     parser.add_argument("--output", metavar="DIR", help="output directory (default: docs/site)")
+    parser.add_argument("--profile", nargs="?", const="build-profile.json", metavar="FILE",
+                        help="report per-stage, per-page and plugin timings and write them as JSON (default: build-profile.json)")
     parser.add_argument("--serve", action="store_true", help="start the live development server after building")
     parser.add_argument("--source", metavar="DIR", help="source project directory (default: current directory)", default=".")
     parser.add_argument("--version", action="version", version=f"%(prog)s {_package_version()}")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+
+    global _PROFILE
+    _PROFILE = None
+    profile_path = None
+    if args.profile:
+        profile_path = os.path.abspath(args.profile)
+        _PROFILE = {"started": time.perf_counter(), "running": None, "stages": [], "pages": [],
+                    "build_hooks": {}, "jobs": args.jobs, "pages_reused": 0}
+        _profile_stage("setup")
 
     # Update output dir if specified. Resolve it before changing directories so
     # relative output paths are interpreted from the original working directory.
@@ -2315,6 +3882,16 @@ def main():
     if args.source != ".":
         os.chdir(args.source)
 
+    # Warm caches are keyed by relative path; another project starts cold
+    global _WARM_ROOT
+    if _WARM_ROOT != os.getcwd():
+        _WARM_ROOT = os.getcwd()
+        _SOURCE_CACHE.clear()
+        _file_digest_cache.clear()
+        _last_modified_stamped.clear()
+        _SEARCH_TEXT_CACHE.clear()
+        _SEARCH_TEXT_SHARDS.clear()
+
     # Reload config/theme from the source directory so --source actually uses
     # the target project's configuration, not the tool's checkout defaults.
     global CONFIG, BASE_URL, THEME_CONFIG
@@ -2342,8 +3919,7 @@ def main():
     if not CFG_PATH.exists():
         derived = None
         if os.path.exists("README.md"):
-            with open("README.md", "r", encoding="utf8") as f:
-                derived = extract_title(remove_frontmatter(f.read()))
+            derived = extract_title(load_source("README.md")['body'])
         if not derived or derived == "Untitled":
             derived = os.path.basename(os.path.abspath(".")) or "Documentation"
         CONFIG["project_name"] = derived
@@ -2354,16 +3930,29 @@ def main():
     # Load user plugins before anything is generated
     global _PLUGINS
     _PLUGINS = _load_plugins()
+    _refresh_markdown_engines()
     for plugin in _PLUGINS:
         hook = getattr(plugin, 'before_build', None)
         if callable(hook):
             try:
-                hook(CONFIG, OUTPUT_DIR)
+                with _plugin_timer(_PROFILE and _PROFILE['build_hooks'], plugin, 'before_build'):
+                    hook(CONFIG, OUTPUT_DIR)
             except Exception as e:
                 print(f"Warning: before_build hook failed in {plugin.__name__}: {e}")
 
+    # One git history walk (or a cached one for this HEAD) instead of a git
+    # subprocess per page for sitemap, feed, and page dates.
+    global _git_dates
+    _git_dates = None
+    _profile_stage("git_dates")
+    load_git_last_modified(OUTPUT_DIR)
+    _load_image_cache(OUTPUT_DIR)
+
+    _profile_stage("copy_static_files")
     copy_static_files()
+    _profile_stage("concatenated_markdown")
     generate_concatenated_markdown() # Call the new function here
+    _profile_stage("social_card")
     pages = []
     search_data_for_index = []
     os.makedirs(OUTPUT_DIR, exist_ok=True)
@@ -2372,19 +3961,28 @@ def main():
     card_path = pathlib.Path(OUTPUT_DIR) / "social-card.png"
     should_generate = args.regen_card or not social.get("image") or not card_path.exists()
 
+    # A rebuild in the same process (dev server) skips redrawing an
+    # unchanged card
+    global _SOCIAL_CARD_KEY
+    card_args = (social.get("title", CONFIG["project_name"]),
+                 social.get("tagline") or CONFIG.get("tagline") or "",
+                 social.get("theme", "light"), social.get("font", "Poppins"), social.get("logo"))
+    card_key = (card_args, _file_stamp(card_args[4]) if card_args[4] else None)
+    if should_generate and not args.regen_card and card_key == _SOCIAL_CARD_KEY \
+            and os.path.exists(os.path.join("docs", "site", "social-card.png")):
+        should_generate = False
+
     if should_generate:
         try:
             from wingtip.generate_card import generate_social_card
         except ImportError:
             # For direct script execution
             from .generate_card import generate_social_card
-        generate_social_card(
-            social.get("title", CONFIG["project_name"]),
-            social.get("tagline") or CONFIG.get("tagline") or "",
-            theme=social.get("theme", "light"),
-            font=social.get("font", "Poppins"),
-            logo=social.get("logo"),
-        )
+        generate_social_card(card_args[0], card_args[1], theme=card_args[2], font=card_args[3], logo=card_args[4])
+        _SOCIAL_CARD_KEY = card_key
+
+    if card_path.exists():
+        _emit_artifact(card_path)
 
     if not CONFIG["og_image"]:
         CONFIG["og_image"] = f'{BASE_URL}/social-card.png'
@@ -2395,6 +3993,7 @@ def main():
             shutil.copy2(card_path, root_card)
 
     # First collect all doc files and their titles
+    _profile_stage("collect_nav")
     docs_dir = "docs"
     nav_pages = []
     sitemap_pages = []
@@ -2411,30 +4010,23 @@ def main():
             return True
         return False
     
-    # Start with README if it exists
-    if os.path.exists("README.md"):
-        with open("README.md", "r", encoding="utf8") as f:
-            readme_content_raw = f.read()
-        readme_front = parse_frontmatter(readme_content_raw)
-        readme_title = extract_title(readme_content_raw)
-        readme_md_content_no_frontmatter = remove_frontmatter(readme_content_raw)
-        if not _is_noindex(readme_front):
-            search_data_for_index.append({
-                "title": readme_title,
-                "content_md": readme_md_content_no_frontmatter,
-                "url": "index.html"
-            })
-        nav_pages.append((readme_title, "index.html", "README.md", readme_front))
-    
-    # Then collect all .md files from the docs directory recursively,
-    # preserving nested source paths in generated URLs.
-    seen_outputs = {"index.html": "README.md"} if nav_pages else {}
-    for md_path in _discover_doc_files(docs_dir):
+    # Start with README if it exists, then all .md files from the docs
+    # directory recursively, preserving nested source paths in generated URLs.
+    seen_outputs = {}
+    for doc in _source_corpus(docs_dir):
+        md_path, front, title = doc['path'], doc['front'], doc['title']
+        if md_path == "README.md":
+            if not doc['noindex']:
+                search_data_for_index.append({
+                    "title": title,
+                    "content_md": doc['body'],
+                    "url": "index.html"
+                })
+            nav_pages.append((title, "index.html", md_path, front))
+            seen_outputs["index.html"] = md_path
+            continue
+
         name = os.path.basename(md_path)
-        with open(md_path, "r", encoding="utf8") as f:
-            md_content_raw = f.read()
-        front = parse_frontmatter(md_content_raw)
-        title = extract_title(md_content_raw)
         html_filename = _doc_html_filename(md_path, docs_dir)
 
         if html_filename in seen_outputs:
@@ -2442,15 +4034,13 @@ def main():
             continue
         seen_outputs[html_filename] = md_path
 
-        if name != "404.md" and not _is_noindex(front):
-            md_content_no_frontmatter = remove_frontmatter(md_content_raw)
-            category_val = str(front.get('category', '') or '').strip() if isinstance(front, dict) else ''
+        if name != "404.md" and not doc['noindex']:
             version_val = str(front.get('version', '') or '').strip() if isinstance(front, dict) else ''
             search_data_for_index.append({
                 "title": title,
-                "content_md": md_content_no_frontmatter,
+                "content_md": doc['body'],
                 "url": html_filename,
-                "category": category_val,
+                "category": doc['category'],
                 "version": version_val
             })
         nav_pages.append((title, html_filename, md_path, front))
@@ -2458,20 +4048,46 @@ def main():
     # Section hub pages (_category.json "index": true)
     _generate_section_hubs(docs_dir, seen_outputs, nav_pages, search_data_for_index)
 
+    # Incremental builds: pages whose build key (source, shared inputs,
+    # sidebar, prev/next) matches the previous build's manifest are reused.
+    _profile_stage("render_pages")
+    fingerprint = _build_fingerprint()
+    previous_manifest = _load_build_manifest(OUTPUT_DIR)
+    previous_pages = {} if args.full else previous_manifest.get('pages', {})
+    manifest_pages = {}
+    image_jobs = []
+
+    def plan(md_path, html_file, **kwargs):
+        task = _page_task(md_path, html_file, fingerprint, **kwargs)
+        entry = previous_pages.get(html_file)
+        if _page_is_current(entry, task['key']):
+            manifest_pages[html_file] = entry
+            return []
+        if _PROFILE is not None:
+            task['profile'] = True
+        return [task]
+
     # Convert all files with prev/next navigation
+    tasks = []
     for i, (title, html_file, md_path, front) in enumerate(nav_pages):
         prev_page = nav_pages[i-1][:2] if i > 0 else None
         next_page = nav_pages[i+1][:2] if i < len(nav_pages)-1 else None
 
         synthetic = isinstance(front, dict) and front.get('_wingtip_synthetic')
-        output_path = os.path.join(OUTPUT_DIR, html_file)
-        front = convert_markdown_file(md_path, output_path, add_edit_link=not synthetic,
-                            prev_page=prev_page, next_page=next_page)
+        tasks += plan(md_path, html_file, add_edit_link=not synthetic,
+                      prev_page=prev_page, next_page=next_page)
+    for html_file, entry, page_images, profile in render_pages(tasks, jobs=args.jobs):
+        manifest_pages[html_file] = entry
+        image_jobs += page_images
+        _profile_page(profile)
+
+    for title, html_file, md_path, front in nav_pages:
         pages.append((f"{OUTPUT_DIR}/{html_file}", md_path))
-        if not _is_noindex(front) and os.path.basename(output_path) != "404.html":
+        if not manifest_pages[html_file]['noindex'] and os.path.basename(html_file) != "404.html":
             sitemap_pages.append((f"{OUTPUT_DIR}/{html_file}", md_path))
 
     # Generate category and version index files for downstream consumers
+    _profile_stage("category_indexes")
     categories_data = {}
     versions_data = {}
     for title, html_file, md_path, front in nav_pages:
@@ -2486,24 +4102,25 @@ def main():
 
     if categories_data:
         categories_json_path = os.path.join(OUTPUT_DIR, 'categories.json')
-        with open(categories_json_path, 'w', encoding='utf8') as f:
+        with open(_emit_artifact(categories_json_path), 'w', encoding='utf8') as f:
             json.dump(categories_data, f, indent=2)
         print(f"Generated categories index: {categories_json_path}")
 
     if versions_data:
         versions_json_path = os.path.join(OUTPUT_DIR, 'versions.json')
-        with open(versions_json_path, 'w', encoding='utf8') as f:
+        with open(_emit_artifact(versions_json_path), 'w', encoding='utf8') as f:
             json.dump(versions_data, f, indent=2)
         print(f"Generated versions index: {versions_json_path}")
 
     # Process 404.md; projects without one get a default so broken URLs
     # land on a styled page instead of the host's bare 404 (add a root
     # 404.md to customize).
+    _profile_stage("render_404")
     fourofour_md_path = pathlib.Path("404.md")
     if not fourofour_md_path.exists():
         import tempfile
         fourofour_md_path = pathlib.Path(tempfile.gettempdir()) / "wingtip_default_404.md"
-        fourofour_md_path.write_text(
+        default_404 = (
             "---\n"
             "permalink: /404.html\n"
             "---\n\n"
@@ -2512,72 +4129,108 @@ def main():
             "## What can you do now?\n\n"
             "- [Return to the homepage](index.html)\n"
             "- Check the URL for typos\n"
-            "- Use the navigation menu to find what you're looking for\n",
-            encoding="utf8",
+            "- Use the navigation menu to find what you're looking for\n"
         )
+        # Rewritten only when missing or changed: its date is part of the
+        # 404 page's build key, so a fresh copy would re-render it every build
+        if not fourofour_md_path.exists() or fourofour_md_path.read_text(encoding="utf8") != default_404:
+            fourofour_md_path.write_text(default_404, encoding="utf8")
     if fourofour_md_path.exists():
         fourofour_html_path = pathlib.Path(OUTPUT_DIR) / "404.html"
         # Title will be extracted by convert_markdown_file from H1 or default to filename
-        front = convert_markdown_file(
-            input_path=str(fourofour_md_path),
-            output_filename=str(fourofour_html_path),
+        fourofour_tasks = plan(
+            str(fourofour_md_path), "404.html",
             add_edit_link=False,  # Typically no "edit this page" for a 404
             prev_page=None,
             next_page=None
         )
+        for html_file, entry, page_images, profile in render_pages(fourofour_tasks):
+            manifest_pages[html_file] = entry
+            image_jobs += page_images
+            _profile_page(profile)
         pages.append((str(fourofour_html_path), str(fourofour_md_path)))
         
         # For GitHub Pages compatibility, also copy 404.html to the root of the site
         # This ensures it works with the permalink: /404.html front matter
 
+    # Image copies and responsive variants, once per source image for all
+    # the pages that reference it
+    _profile_stage("images")
+    generate_images(image_jobs, jobs=args.jobs)
+    _write_image_cache(OUTPUT_DIR)
+
+    for entry in manifest_pages.values():
+        _ARTIFACTS.update(entry['outputs'])
+    reused = sum(1 for html_file, entry in manifest_pages.items() if previous_pages.get(html_file) is entry)
+    if reused:
+        print(f"Rendered {len(manifest_pages) - reused} page(s); {reused} unchanged since the last build")
+    if _PROFILE is not None:
+        _PROFILE['pages_reused'] = reused
+
+    _profile_stage("search_index")
     generate_search_index(search_data_for_index, OUTPUT_DIR)
+    _profile_stage("sitemap")
     write_sitemap_xml(sitemap_pages)
+    _profile_stage("rss_feed")
     generate_rss_feed(sitemap_pages, OUTPUT_DIR)
+    _profile_stage("llms_txt")
     llms_pages = [p for p in nav_pages if not _is_noindex(p[3])]
     write_llms_txt(llms_pages)
     write_skill_md(llms_pages)
     write_robots_txt()
 
     # Static redirect pages and host-level _redirects from config.json
+    _profile_stage("redirects")
     for redirect_file in generate_redirect_pages(OUTPUT_DIR):
         pages.append((redirect_file, ''))
 
-    # Clean up obsolete files
-    cleanup_output_dir([p[0] for p in pages])
-
-    # Generate PWA manifest, icons, offline page, and service worker
+    # Generate PWA manifest, icons, and offline page
+    _profile_stage("pwa")
     generate_pwa_files(pages, OUTPUT_DIR)
 
+    # Remove what the last build wrote and this one did not (sw.js is still
+    # to come), then precache the finished tree
+    _profile_stage("cleanup")
+    cleanup_output_dir(_ARTIFACTS | {"sw.js"}, previous_manifest.get('artifacts'))
+    _profile_stage("service_worker")
+    generate_service_worker(OUTPUT_DIR)
+
+    _profile_stage("build_manifest")
+    _write_build_manifest(OUTPUT_DIR, fingerprint, manifest_pages, _ARTIFACTS)
+
     # Plugin after_build hooks
+    _profile_stage("after_build")
     for plugin in _PLUGINS:
         hook = getattr(plugin, 'after_build', None)
         if callable(hook):
             try:
-                hook(CONFIG, OUTPUT_DIR)
+                with _plugin_timer(_PROFILE and _PROFILE['build_hooks'], plugin, 'after_build'):
+                    hook(CONFIG, OUTPUT_DIR)
             except Exception as e:
                 print(f"Warning: after_build hook failed in {plugin.__name__}: {e}")
 
-    # Start dev server if requested
+    # Optional precompression, last so it sees every artifact (after_build
+    # hooks included)
+    compress, min_size, suffixes = _compression_settings(args.compress)
+    if compress:
+        _profile_stage("compress")
+        compress_output(OUTPUT_DIR, min_size=min_size, suffixes=suffixes, jobs=args.jobs)
+
+    if _PROFILE is not None:
+        _write_build_profile(profile_path)
+        _PROFILE = None
+
+    # Start dev server if requested; it rebuilds in this process, reusing
+    # the caches this build warmed
     if args.serve:
-        import subprocess
-        import time
-        from pathlib import Path
-        
-        serve_script = Path(__file__).parent / "serve.py"
-        
-        if serve_script.exists():
-            print("\nStarting development server...")
-            try:
-                # First attempt to start the server
-                result = subprocess.run([sys.executable, "-m", "wingtip.serve"], capture_output=True, text=True)
-                if result.returncode != 0 and "Address already in use" in result.stderr:
-                    print("Port 8000 is in use. Please free port 8000 manually.")
-                    sys.exit(1)
-                elif result.returncode != 0:
-                    print(f"\nServer failed to start: {result.stderr}")
-                    sys.exit(1)
-            except KeyboardInterrupt:
-                print("\nServer stopped by user")
+        try:
+            from wingtip.serve import serve
+        except ImportError as e:
+            print(f"\nCould not start the development server ({e}). Install it with: pip install \"wingtip[serve]\"")
+            sys.exit(1)
+        print("\nStarting development server...")
+        rebuild_args = ["--jobs", str(args.jobs)] + (["--compress"] if args.compress else [])
+        serve(OUTPUT_DIR, rebuild_args)
 
 if __name__ == "__main__":
     main()
@@ -2,174 +2,728 @@
 
 # serve.py - Development server for WingTip
 
+import io
 import os
+import re
+import json
 import sys
+import time
+import hashlib
 import shutil
-import subprocess
+import argparse
+import tempfile
+import threading
+import mimetypes
+import contextlib
 import webbrowser
+import urllib.parse
 from pathlib import Path
+from collections import OrderedDict
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
 import tornado.ioloop
+import tornado.netutil
+import tornado.process
+import tornado.httpserver
 import tornado.web
-import tornado.autoreload
+import tornado.websocket
 
 # Get absolute paths
 BASE_DIR = Path(__file__).parent
 SITE_DIR = Path("docs") / "site"
 PORT = 8000
 
-def build_site():
-    """Build the site and return True if successful"""
-    print("\n🔨 Building site...")
-    
-    try:
-        # Try building in a temporary directory first
-        tmp_dir = "docs_site_tmp"
-        os.makedirs(tmp_dir, exist_ok=True)
-        result = subprocess.run(
-            [sys.executable, "-m", "wingtip.main", "--output", tmp_dir],
-            capture_output=True,
-            text=True
-        )
-        
-        if result.returncode == 0:
-            print("  ✓ Build successful")
-            # If successful, rebuild for real
-            result = subprocess.run(
-                [sys.executable, "-m", "wingtip.main"],
-                capture_output=True,
-                text=True
-            )
-            return True
-        else:
-            print("  ✗ Build failed:")
-            print(result.stderr)
+# The watcher polls source stamps; changes seen in one poll, and any that
+# arrive while a build runs, are batched into a single rebuild.
+POLL_INTERVAL_MS = 50
+WATCHED_FILES = ("README.md", "404.md", "config.json", "theme.json")
+WATCHED_DIRS = ("docs", "static", "plugins")
+
+# Cache lifetime for content-hashed assets in the static preview server
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+# In-memory response cache: total size, and the largest file worth keeping
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+CACHE_MAX_FILE_BYTES = 4 * 1024 * 1024
+
+# Types missing from some platforms' mimetypes tables
+for _mime_type, _extension in (("text/markdown", ".md"), ("image/svg+xml", ".svg"), ("image/webp", ".webp"),
+                               ("image/avif", ".avif"), ("font/woff2", ".woff2"),
+                               ("application/manifest+json", ".webmanifest")):
+    mimetypes.add_type(_mime_type, _extension)
+
+# Injected before </body> of every HTML response when live reload is on
+LIVERELOAD_SCRIPT = b'<script src="/_wingtip/livereload.js"></script>'
+
+# Served in place of the site's service worker while live reloading: the
+# generated one answers from its cache first, so a reload would show the
+# stale page. This one clears the caches and unregisters itself.
+DEV_SERVICE_WORKER = """self.addEventListener('install', () => self.skipWaiting());
+self.addEventListener('activate', (event) => {
+  event.waitUntil(
+    caches.keys()
+      .then((keys) => Promise.all(keys.map((key) => caches.delete(key))))
+      .then(() => self.registration.unregister())
+  );
+});
+"""
+
+def _source_stamps(exclude):
+    """(mtime_ns, size) of every watched source file, by path.
+
+    Skips dot-directories and the output directories in exclude, so the
+    build's own writes never trigger a rebuild.
+    """
+    stamps = {}
+    for name in WATCHED_FILES:
+        try:
+            st = os.stat(name)
+            stamps[name] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            pass
+    pending = [d for d in WATCHED_DIRS if os.path.isdir(d)]
+    while pending:
+        directory = pending.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.name.startswith(".") or entry.name == "__pycache__":
+                continue
+            try:
+                if entry.is_dir():
+                    if os.path.abspath(entry.path) not in exclude:
+                        pending.append(entry.path)
+                else:
+                    st = entry.stat()
+                    stamps[entry.path] = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                pass
+    return stamps
+
+class BuildOutput:
+    """Stands in for sys.stdout while the dev server runs.
+
+    Writes from a thread inside capture() go to that thread's buffer, all
+    others to the real stream. contextlib.redirect_stdout would swap the
+    stream for the whole process, so the server's own output printed while
+    a build runs would land in the build log.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    @contextlib.contextmanager
+    def capture(self):
+        self.local.buffer = io.StringIO()
+        try:
+            yield self.local.buffer
+        finally:
+            self.local.buffer = None
+
+    def _target(self):
+        buffer = getattr(self.local, "buffer", None)
+        return self.stream if buffer is None else buffer
+
+    def write(self, text):
+        return self._target().write(text)
+
+    def flush(self):
+        self._target().flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+class SiteBuilder:
+    """Rebuilds the site in this process, off the server's event loop.
+
+    wingtip.main stays imported, so each rebuild is an incremental build
+    with warm source caches (only pages whose inputs changed re-render).
+    Builds alternate between the output directory and a standby copy, and
+    the server switches to a directory only once a build into it has
+    finished: a request never sees a half-written site.
+    """
+
+    def __init__(self, output_dir, build_args=()):
+        self.output_dir = os.path.abspath(output_dir)
+        self.build_args = list(build_args)
+        self.site = {"root": self.output_dir, "clients": set(), "cache": ResponseCache()}
+        self.temp_dir = self.standby = tempfile.mkdtemp(prefix="wingtip-serve-")
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="wingtip-build")
+        self.building = False
+        self.pending = set()
+        self.stamps = {}
+        self.pages = {}
+        # The standby starts as a copy, so its first build is incremental too
+        self.executor.submit(shutil.copytree, self.output_dir, self.standby, symlinks=True, dirs_exist_ok=True)
+        self.executor.submit(self.changed_pages, self.output_dir)
+
+    def build(self, target):
+        """Build into target; True on success. Build output is shown only
+        when it contains warnings or the build fails."""
+        from wingtip import main as wingtip_main
+        if not isinstance(sys.stdout, BuildOutput):
+            sys.stdout = BuildOutput(sys.stdout)
+        try:
+            with sys.stdout.capture() as log:
+                wingtip_main.main(["--output", target] + self.build_args)
+        except (Exception, SystemExit) as e:
+            print(log.getvalue(), end="")
+            print(f"  ✗ Build failed: {e}")
             return False
-    except Exception as e:
-        print(f"  ✗ Build error: {e}")
-        return False
-    finally:
-        # Clean up temp dir
-        if os.path.exists(tmp_dir):
-            shutil.rmtree(tmp_dir)
+        for line in log.getvalue().splitlines():
+            if "warning" in line.lower() or "error" in line.lower():
+                print(f"  {line}")
+        return True
+
+    def changed_pages(self, target):
+        """HTML files whose build manifest entry differs between the served
+        site and the build in target.
+
+        The entry covers the page's build key, its outputs, and the images
+        it embeds, so this is exactly the set of pages a tab would see
+        change on reload.
+        """
+        from wingtip import main as wingtip_main
+        pages = wingtip_main._load_build_manifest(target).get("pages", {})
+        changed = {page for page in pages.keys() | self.pages.keys() if pages.get(page) != self.pages.get(page)}
+        self.pages = pages
+        return changed
+
+    def sync_standby(self, pages):
+        """Copy the pages just rebuilt, and the manifest, into the standby
+        directory, so its next build does not render them again.
+
+        Files the standby's own last build wrote and the live build no
+        longer writes are removed first: once the standby holds the live
+        manifest, its next build's cleanup would not know about them.
+        """
+        from wingtip import main as wingtip_main
+        live = self.site["root"]
+        outputs = [rel for page in pages for rel in self.pages.get(page, {}).get("outputs", [])]
+        standby_artifacts = set(wingtip_main._load_build_manifest(self.standby).get("artifacts", []))
+        live_artifacts = set(wingtip_main._load_build_manifest(live).get("artifacts", []))
+        for rel in standby_artifacts - live_artifacts:
+            for path in [os.path.join(self.standby, rel)] + [os.path.join(self.standby, rel + suffix) for suffix in wingtip_main._COMPRESSED_SUFFIXES]:
+                with contextlib.suppress(OSError):
+                    os.remove(path)
+        try:
+            # The manifest last: it must not vouch for a page that failed to copy
+            for rel in outputs + [wingtip_main.BUILD_MANIFEST_NAME]:
+                target = os.path.join(self.standby, rel)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.copy2(os.path.join(live, rel), target)
+        except OSError:
+            pass
+
+    def start_watching(self):
+        self.stamps = _source_stamps(self._excluded())
+        tornado.ioloop.PeriodicCallback(self.poll, POLL_INTERVAL_MS).start()
+
+    def _excluded(self):
+        return {self.output_dir, self.standby, os.path.abspath(SITE_DIR)}
+
+    def poll(self):
+        stamps = _source_stamps(self._excluded())
+        if stamps == self.stamps:
+            return
+        changed = {path for path in stamps.keys() | self.stamps.keys() if stamps.get(path) != self.stamps.get(path)}
+        self.stamps = stamps
+        self.pending |= changed
+        if not self.building:
+            tornado.ioloop.IOLoop.current().spawn_callback(self.rebuild)
+
+    async def rebuild(self):
+        """Build the standby directory and swap it in; repeat while changes
+        arrived during the build."""
+        self.building = True
+        try:
+            while self.pending:
+                changed, self.pending = sorted(self.pending), set()
+                shown = ", ".join(changed[:3]) + (f" and {len(changed) - 3} more" if len(changed) > 3 else "")
+                print(f"\n🔄 Changed: {shown}")
+                started = time.perf_counter()
+                target = self.standby
+                loop = tornado.ioloop.IOLoop.current()
+                ok = await loop.run_in_executor(self.executor, self.build, target)
+                if ok:
+                    pages = await loop.run_in_executor(self.executor, self.changed_pages, target)
+                    self.standby, self.site["root"] = self.site["root"], target
+                    self.site["cache"].clear()
+                    print(f"  ✓ Rebuilt in {(time.perf_counter() - started) * 1000:.0f} ms")
+                    self.notify(changed, pages)
+                    self.executor.submit(self.sync_standby, pages)
+        finally:
+            self.building = False
+
+    def notify(self, sources, pages):
+        """Tell the tabs showing a rebuilt page to refresh.
+
+        When every changed source is a stylesheet or theme.json, the tabs
+        swap their styles in place instead of reloading. Static files are
+        not page inputs unless fingerprinted, so a change under static/
+        reaches every tab, whichever pages the build re-rendered.
+        """
+        styles_only = all(path == "theme.json" or (path.split(os.sep)[0] == "static" and path.endswith(".css"))
+                          for path in sources)
+        static_changed = any(path.split(os.sep)[0] == "static" for path in sources)
+        message = json.dumps({"action": "css" if styles_only else "reload"})
+        refreshed = 0
+        for client in list(self.site["clients"]):
+            # A tab on a missing page shows 404.html until the page exists
+            if styles_only or static_changed or client.page in pages or \
+                    (client.page not in self.pages and "404.html" in pages):
+                try:
+                    client.write_message(message)
+                    refreshed += 1
+                except tornado.websocket.WebSocketClosedError:
+                    self.site["clients"].discard(client)
+        if refreshed:
+            print(f"  ↻ {'Restyled' if styles_only else 'Reloaded'} {refreshed} tab{'s' if refreshed != 1 else ''}")
+
+    def close(self):
+        """Leave the output directory holding the latest build."""
+        self.executor.shutdown(wait=True)
+        if self.site["root"] != self.output_dir:
+            self.build(self.output_dir)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+class ResponseCache:
+    """LRU cache of response bodies by file path.
+
+    Entries are validated against the file's (mtime_ns, size) on every
+    lookup, and the builder clears the cache when it swaps in a rebuild.
+    """
+
+    def __init__(self, max_bytes=CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+
+    def get(self, path, stamp):
+        """(content, etag) cached for path at stamp, or None."""
+        entry = self.entries.get(path)
+        if entry is None or entry[0] != stamp:
+            return None
+        self.entries.move_to_end(path)
+        return entry[1:]
+
+    def put(self, path, stamp, content, etag):
+        if len(content) > CACHE_MAX_FILE_BYTES:
+            return
+        old = self.entries.pop(path, None)
+        if old is not None:
+            self.size -= len(old[1])
+        self.entries[path] = (stamp, content, etag)
+        self.size += len(content)
+        while self.size > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted[1])
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+
+def content_type(path):
+    """Content-Type for a file, by extension; text types are UTF-8."""
+    mime_type, _ = mimetypes.guess_type(path)
+    if not mime_type:
+        return "application/octet-stream"
+    if mime_type.startswith("text/") or mime_type in ("application/javascript", "application/json", "application/xml",
+                                                        "application/manifest+json", "image/svg+xml"):
+        return f"{mime_type}; charset=UTF-8"
+    return mime_type
+
+def read_file(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+def page_file(root, path):
+    """The file MainHandler serves for a URL path under root."""
+    # Default to index.html if no path is specified
+    if not path:
+        path = "index.html"
+
+    file_path = os.path.join(root, path)
+
+    # If it's a directory, look for index.html
+    if os.path.isdir(file_path):
+        return os.path.join(file_path, "index.html")
+
+    # Extensionless page URLs map to their .html file; any other file
+    # (Markdown siblings, XML, SVG, fonts) is served as-is
+    if not os.path.isfile(file_path) and not path.endswith((".html", "/")):
+        file_path = file_path + ".html"
+    return file_path
+
+def inject_livereload(content):
+    """Add the live-reload client script to an HTML document."""
+    end = content.rfind(b"</body>")
+    if end == -1:
+        return content + LIVERELOAD_SCRIPT
+    return content[:end] + LIVERELOAD_SCRIPT + content[end:]
+
+def accepted_encodings(request):
+    """Content codings the client accepts (Accept-Encoding, ignoring q=0)."""
+    accepted = set()
+    for part in request.headers.get("Accept-Encoding", "").split(","):
+        name, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) == 0:
+                    continue
+            except ValueError:
+                pass
+        if name:
+            accepted.add(name.strip().lower())
+    return accepted
+
+def precompressed_sibling(request, file_path):
+    """Return (encoding, path) for the best current .br/.gz sibling written
+    by `wingtip --compress` that the client accepts, else (None, file_path)."""
+    accepted = accepted_encodings(request)
+    for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+        sibling = file_path + suffix
+        if (encoding in accepted or "*" in accepted) and os.path.isfile(sibling) \
+                and os.path.getmtime(sibling) >= os.path.getmtime(file_path):
+            return encoding, sibling
+    return None, file_path
+
+class PrecompressedStaticFileHandler(tornado.web.StaticFileHandler):
+    """StaticFileHandler that sends a precompressed sibling when accepted."""
+
+    def initialize(self, site, default_filename=None):
+        super().initialize(site["root"], default_filename)
+
+    def validate_absolute_path(self, root, absolute_path):
+        absolute_path = super().validate_absolute_path(root, absolute_path)
+        self.original_path = absolute_path
+        self.set_header("Vary", "Accept-Encoding")
+        if absolute_path and os.path.isfile(absolute_path):
+            encoding, absolute_path = precompressed_sibling(self.request, absolute_path)
+            if encoding:
+                self.set_header("Content-Encoding", encoding)
+                # The base class cached the stat of the uncompressed file
+                self._stat_result = os.stat(absolute_path)
+        return absolute_path
+
+    def get_content_type(self):
+        return content_type(self.original_path)
+
+class LiveReloadHandler(tornado.websocket.WebSocketHandler):
+    """Push channel to open tabs. A tab sends {"path": location.pathname}
+    once connected, and is told to refresh when that page is rebuilt."""
+
+    def initialize(self, site):
+        self.site = site
+        self.page = None
+
+    def on_message(self, message):
+        try:
+            path = urllib.parse.unquote(json.loads(message)["path"]).lstrip("/")
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return
+        root = self.site["root"]
+        self.page = os.path.relpath(page_file(root, path), root).replace(os.sep, "/")
+        self.site["clients"].add(self)
+
+    def on_close(self):
+        self.site["clients"].discard(self)
+
+class DevServiceWorkerHandler(tornado.web.RequestHandler):
+    def get(self):
+        self.set_header("Content-Type", "application/javascript")
+        self.set_header("Cache-Control", "no-cache")
+        self.write(DEV_SERVICE_WORKER)
 
 # Custom handler for serving files and handling 404 errors
 class MainHandler(tornado.web.RequestHandler):
-    def initialize(self, root_path):
-        self.root_path = root_path
-        
-    def get(self, path):
-        # Default to index.html if no path is specified
-        if not path:
-            path = "index.html"
-        
-        # Add .html extension if not present and not a directory
-        if not path.endswith(".html") and not path.endswith("/") and \
-           not os.path.isdir(os.path.join(self.root_path, path)):
-            path = path + ".html"
-            
-        file_path = os.path.join(self.root_path, path)
-        
-        # If it's a directory, look for index.html
-        if os.path.isdir(file_path):
-            file_path = os.path.join(file_path, "index.html")
-            
-        # If the file exists, serve it
-        if os.path.exists(file_path) and os.path.isfile(file_path):
-            with open(file_path, "rb") as f:
-                content = f.read()
-            
-            # Set content type based on file extension
-            if file_path.endswith(".html"):
-                self.set_header("Content-Type", "text/html")
-            elif file_path.endswith(".css"):
-                self.set_header("Content-Type", "text/css")
-            elif file_path.endswith(".js"):
-                self.set_header("Content-Type", "application/javascript")
-            elif file_path.endswith(".png"):
-                self.set_header("Content-Type", "image/png")
-            elif file_path.endswith(".jpg") or file_path.endswith(".jpeg"):
-                self.set_header("Content-Type", "image/jpeg")
-            
-            self.write(content)
-        else:
+    """Serves pages and other files the static route doesn't match.
+
+    Bodies come from the site's ResponseCache when current; misses are
+    read off the event loop. Responses carry a strong ETag and must be
+    revalidated (Cache-Control: no-cache), so a matching If-None-Match
+    gets a 304 and an edited page is never served stale. HEAD takes the
+    same path and sends the headers without the body.
+    """
+
+    def initialize(self, site):
+        # Read per request: the builder swaps in a new directory after each rebuild
+        self.root_path = site["root"]
+        self.livereload = site.get("livereload", False)
+        self.cache = site["cache"]
+
+    def head(self, path):
+        return self.get(path, include_body=False)
+
+    async def get(self, path, include_body=True):
+        file_path = page_file(self.root_path, path)
+        if not os.path.isfile(file_path):
             # File not found, serve 404 page
             self.set_status(404)
-            error_page = os.path.join(self.root_path, "404.html")
-            if os.path.exists(error_page):
-                with open(error_page, "rb") as f:
-                    self.write(f.read())
+            file_path = os.path.join(self.root_path, "404.html")
+            if not os.path.isfile(file_path):
+                if include_body:
+                    self.write("<html><head><title>404: Not Found</title></head><body>404: Not Found</body></html>")
+                return
+
+        injecting = self.livereload and file_path.endswith(".html")
+        if injecting:
+            # The page is rewritten, so its precompressed copy can't be used
+            encoding, body_path = None, file_path
+        else:
+            encoding, body_path = precompressed_sibling(self.request, file_path)
+        try:
+            st = os.stat(body_path)
+        except OSError:
+            raise tornado.web.HTTPError(404)
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self.cache.get(body_path, stamp)
+        if cached is None:
+            content = await tornado.ioloop.IOLoop.current().run_in_executor(None, read_file, body_path)
+            if injecting:
+                content = inject_livereload(content)
+            etag = '"%s"' % hashlib.sha1(content).hexdigest()
+            self.cache.put(body_path, stamp, content, etag)
+        else:
+            content, etag = cached
+
+        self.set_header("Content-Type", content_type(file_path))
+        self.set_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.set_header("Content-Encoding", encoding)
+        self.set_header("Etag", etag)
+        self.set_header("Last-Modified", datetime.fromtimestamp(st.st_mtime, timezone.utc))
+        self.set_header("Cache-Control", "no-cache")
+        if self.get_status() == 200 and self.check_etag_header():
+            self.set_status(304)
+            return
+        if include_body:
+            self.write(content)
+        else:
+            self.set_header("Content-Length", len(content))
+
+def load_redirects(root):
+    """Rules from the `_redirects` file generate_redirect_pages writes
+    (Netlify/Cloudflare Pages format, `from to [status]` per line), as
+    (pattern, to, status) tuples in file order."""
+    rules = []
+    try:
+        with open(os.path.join(root, "_redirects"), encoding="utf8") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return rules
+    for line in lines:
+        fields = line.split("#", 1)[0].split()
+        if len(fields) < 2:
+            continue
+        source, target = fields[0], fields[1]
+        status = int(fields[2].rstrip("!")) if len(fields) > 2 and fields[2].rstrip("!").isdigit() else 301
+        parts = []
+        for segment in source.rstrip("/").split("/"):
+            if segment.endswith("*"):
+                parts.append(re.escape(segment[:-1]) + "(?P<splat>.*)")
+            elif segment.startswith(":") and segment[1:].isidentifier():
+                parts.append(f"(?P<{segment[1:]}>[^/]+)")
+            else:
+                parts.append(re.escape(segment))
+        rules.append((re.compile("/".join(parts) + "/?$"), target, status))
+    return rules
+
+def match_redirect(rules, path):
+    """(target, status) of the first rule matching a URL path, or None.
+    Placeholders (:name) and the splat (*) are substituted into the target."""
+    for pattern, target, status in rules:
+        match = pattern.match(path)
+        if match:
+            for name, value in match.groupdict().items():
+                target = target.replace(f":{name}", value or "")
+            return target, status
+    return None
+
+def immutable_assets(root):
+    """Published paths of content-hashed assets, from asset-manifest.json."""
+    try:
+        with open(os.path.join(root, "asset-manifest.json"), encoding="utf8") as f:
+            assets = json.load(f)
+    except (OSError, ValueError):
+        return set()
+    # With fingerprinting off, names map to themselves and may change content
+    return {published for original, published in assets.items() if published != original}
+
+class PreviewHandler(PrecompressedStaticFileHandler):
+    """Serves a finished build the way a static host would.
+
+    Page URLs resolve to their .html file or a directory's index.html;
+    a path with no file is looked up in the build's `_redirects` rules
+    (3xx statuses redirect, 200 rewrites), then answered with 404.html.
+    Content-hashed assets are sent as immutable; everything else must be
+    revalidated against its ETag.
+    """
+
+    def initialize(self, site):
+        super().initialize(site, default_filename="index.html")
+        self.site = site
+
+    def validate_absolute_path(self, root, absolute_path):
+        if not os.path.exists(absolute_path):
+            if not absolute_path.endswith(".html") and os.path.isfile(absolute_path + ".html"):
+                absolute_path += ".html"
             else:
-                self.write("<html><head><title>404: Not Found</title></head><body>404: Not Found</body></html>")
+                rule = match_redirect(self.site["redirects"], urllib.parse.unquote(self.request.path))
+                if rule:
+                    target, status = rule
+                    if status == 200 and not target.startswith(("http://", "https://")):
+                        absolute_path = os.path.abspath(os.path.join(root, target.lstrip("/")))
+                        if os.path.isdir(absolute_path):
+                            absolute_path = os.path.join(absolute_path, "index.html")
+                        elif not os.path.exists(absolute_path) and os.path.isfile(absolute_path + ".html"):
+                            absolute_path += ".html"
+                    else:
+                        if self.request.query and "?" not in target:
+                            target += "?" + self.request.query
+                        self.redirect(target, status=status if 300 <= status < 400 else 301)
+                        return None
+        return super().validate_absolute_path(root, absolute_path)
+
+    def set_extra_headers(self, path):
+        if path in self.site["immutable"]:
+            self.set_header("Cache-Control", f"public, max-age={IMMUTABLE_MAX_AGE}, immutable")
+        else:
+            self.set_header("Cache-Control", "no-cache")
+
+    def write_error(self, status_code, **kwargs):
+        error_page = os.path.join(self.root, "404.html")
+        if status_code == 404 and os.path.isfile(error_page):
+            self.set_header("Content-Type", "text/html; charset=UTF-8")
+            self.finish(read_file(error_page))
+        else:
+            super().write_error(status_code, **kwargs)
+
+def make_app(site=None):
+    """Application serving site["root"], which may change between requests.
 
-def make_app():
-    site_path = str(SITE_DIR.absolute())
-    return tornado.web.Application([
+    With site["livereload"], pages get the live-reload client and the
+    server accepts its WebSocket connections.
+    """
+    site = site if site is not None else {"root": str(SITE_DIR.absolute())}
+    site.setdefault("clients", set())
+    site.setdefault("cache", ResponseCache())
+    routes = []
+    if site.get("livereload"):
+        routes += [
+            (r"/_wingtip/livereload", LiveReloadHandler, {"site": site}),
+            (r"/_wingtip/(livereload\.js)", tornado.web.StaticFileHandler, {"path": str(BASE_DIR)}),
+            (r"/sw\.js", DevServiceWorkerHandler),
+        ]
+    return tornado.web.Application(routes + [
         # Serve static files directly
-        (r"/(.+\.(css|js|png|jpg|jpeg|gif|ico|txt|json))", tornado.web.StaticFileHandler, {"path": site_path}),
+        (r"/(.+\.(css|js|png|jpg|jpeg|gif|ico|txt|json))", PrecompressedStaticFileHandler, {"site": site}),
         # Main handler for HTML files and 404s
-        (r"/(.*)", MainHandler, {"root_path": site_path}),
-    ], debug=True)
-
-def watch_files():
-    """Watch files for changes and rebuild the site"""
-    # Watch root level files
-    root_files = ["README.md", "template.html", "main.py", "404.md", "theme.json", "config.json"]
-    for file in root_files:
-        if os.path.exists(file):
-            tornado.autoreload.watch(os.path.abspath(file))
-    
-    # Watch all .md files in docs directory recursively
-    docs_dir = os.path.abspath("docs")
-    for root, _, files in os.walk(docs_dir):
-        for file in files:
-            if file.endswith(".md"):
-                file_path = os.path.join(root, file)
-                tornado.autoreload.watch(file_path)
-    
-    # Add a callback to rebuild the site
-    def rebuild_callback():
-        print("\n🔄 File change detected, rebuilding site...")
-        build_site()
-    
-    tornado.autoreload.add_reload_hook(rebuild_callback)
+        (r"/(.*)", MainHandler, {"site": site}),
+    ], debug=True, autoreload=False)
 
-if __name__ == "__main__":
-    print("Building site and starting dev server...")
-    
-    # Initial build
-    if not build_site():
-        print("Initial build failed. Fix errors and try again.")
+def serve(output_dir=SITE_DIR, build_args=(), port=PORT, open_browser=True, host=""):
+    """Serve a built site, rebuilding it in-process as sources change."""
+    builder = SiteBuilder(output_dir, build_args)
+    builder.site["livereload"] = True
+    app = make_app(builder.site)
+    try:
+        app.listen(port, address=host)
+    except OSError as e:
+        print(f"Could not listen on port {port}: {e}")
+        builder.close()
         sys.exit(1)
-    
-    # Create application
-    app = make_app()
-    
-    # Watch for file changes
-    watch_files()
-    
-    # Start server
-    app.listen(PORT)
-    print(f"\n🌐 Starting server at http://localhost:{PORT}")
+    builder.start_watching()
+    url = f"http://{host if host not in ('', '0.0.0.0', '::') else 'localhost'}:{port}"
+    print(f"\n🌐 Starting server at {url}")
     print(f"   Custom 404 page handling is enabled")
-    
-    # Open browser only on initial start, not on reloads
-    # Create a flag file to track if browser has been opened
-    browser_flag_file = Path(".browser_opened")
-    
-    def open_browser():
-        if not browser_flag_file.exists():
+
+    if open_browser:
+        def open_page():
             try:
-                webbrowser.open(f"http://localhost:{PORT}")
-                # Create flag file to prevent reopening
-                browser_flag_file.touch()
+                webbrowser.open(url)
             except Exception as e:
                 print(f"Warning: Could not open browser: {e}")
-    
-    # Open browser in a separate thread to avoid blocking
-    import threading
-    threading.Timer(0.5, open_browser).start()
-    
+        tornado.ioloop.IOLoop.current().call_later(0.5, open_page)
+
     print("\nServer is ready! Press Ctrl+C to stop.")
-    
-    # Start event loop
-    tornado.ioloop.IOLoop.current().start()
+    try:
+        tornado.ioloop.IOLoop.current().start()
+    except KeyboardInterrupt:
+        print("\nServer stopped by user")
+    finally:
+        builder.close()
+
+def serve_static(output_dir=SITE_DIR, port=PORT, host="", workers=1):
+    """Serve a finished build as-is: no build, no watcher, no live reload.
+
+    The listening socket is bound once and shared by `workers` processes
+    (0: one per CPU).
+    """
+    root = os.path.abspath(output_dir)
+    if not os.path.isfile(os.path.join(root, "index.html")):
+        print(f"No built site in {root}. Build it first with: wingtip --output {output_dir}")
+        sys.exit(1)
+    site = {"root": root, "redirects": load_redirects(root), "immutable": immutable_assets(root)}
+    app = tornado.web.Application([(r"/(.*)", PreviewHandler, {"site": site})])
+    try:
+        sockets = tornado.netutil.bind_sockets(port, address=host or None)
+    except OSError as e:
+        print(f"Could not listen on port {port}: {e}")
+        sys.exit(1)
+    url = f"http://{host if host not in ('', '0.0.0.0', '::') else 'localhost'}:{port}"
+    processes = workers or os.cpu_count() or 1
+    print(f"🌐 Serving {root} at {url} ({processes} worker{'s' if processes != 1 else ''}, "
+          f"{len(site['redirects'])} redirect rule{'s' if len(site['redirects']) != 1 else ''})")
+    print("Press Ctrl+C to stop.")
+    try:
+        if processes > 1:
+            tornado.process.fork_processes(processes)
+        server = tornado.httpserver.HTTPServer(app)
+        server.add_sockets(sockets)
+        tornado.ioloop.IOLoop.current().start()
+    except KeyboardInterrupt:
+        if tornado.process.task_id() is None:
+            print("\nServer stopped by user")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="wingtip serve",
+        description="Serve a WingTip site. By default the site is built and served with in-process rebuilds and live reload; --static serves an existing build the way a static host would.",
+    )
+    parser.add_argument("--static", action="store_true", help="serve the output directory as-is (no build, watcher, or live reload)")
+    parser.add_argument("--output", metavar="DIR", default=str(SITE_DIR), help="site directory to serve (default: docs/site)")
+    parser.add_argument("--host", default="", help="address to listen on (default: all interfaces)")
+    parser.add_argument("--port", type=int, default=PORT, help=f"port to listen on (default: {PORT})")
+    parser.add_argument("--workers", type=int, default=1, metavar="N", help="with --static, serve from N processes (0: one per CPU)")
+    args = parser.parse_args(argv)
+
+    if args.static:
+        if args.workers != 1 and not hasattr(os, "fork"):
+            print("--workers needs a platform with fork(); serving from one process")
+            args.workers = 1
+        serve_static(args.output, port=args.port, host=args.host, workers=args.workers)
+        return
+    if args.workers != 1:
+        parser.error("--workers requires --static")
+
+    print("Building site and starting dev server...")
+
+    # Initial build, in this process: rebuilds reuse its warm caches
+    print("\n🔨 Building site...")
+    builder_output = os.path.abspath(args.output)
+    from wingtip import main as wingtip_main
+    try:
+        wingtip_main.main(["--output", builder_output])
+    except Exception as e:
+        print(f"  ✗ Build error: {e}")
+        print("Initial build failed. Fix errors and try again.")
+        sys.exit(1)
+    serve(builder_output, port=args.port, host=args.host)
+
+if __name__ == "__main__":
+    main()
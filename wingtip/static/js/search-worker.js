@@ -0,0 +1,226 @@
+// Search worker: loads the sharded index and evaluates queries off the
+// page's main thread. search.js posts
+//   {type: 'init', root}         site root URL the index files live under
+//   {type: 'warm'}               fetch the manifest ahead of the first query
+//   {type: 'query', id, query}   rank pages for a query
+//   {type: 'cancel', id}         drop every query older than id
+// and receives {id, results: [{url, titleHtml, snippetHtml}]} or
+// {id, error}. Only the latest query is answered; older ones stop at
+// their next await and never post back.
+
+const MAX_RESULTS = 50;
+const SNIPPET_LENGTH = 150;
+
+let siteRoot = null;
+let latestId = 0;
+
+// search_index.json is a small manifest (titles, URLs, shard names); term
+// and text shards are fetched the first time a query needs them.
+const files = new Map();
+function loadFile(path) {
+  if (!files.has(path)) {
+    const request = fetch(new URL(path, siteRoot)).then(response => {
+      if (!response.ok) {
+        throw new Error('Network response was not ok for ' + path);
+      }
+      return response.json();
+    });
+    request.catch(() => files.delete(path));
+    files.set(path, request);
+  }
+  return files.get(path);
+}
+const loadManifest = () => loadFile('search_index.json');
+
+// Same tokenization as the build (Python's \w+ on lowercased text)
+function tokenize(text) {
+  return text.toLowerCase().match(/[\p{L}\p{N}_]+/gu) || [];
+}
+
+// Ranked lookup over the inverted index: BM25 over field-boosted term
+// frequencies. Each query token matches indexed terms exactly or as a
+// prefix (prefix hits count for less), and a page must match every token.
+// Work per query is proportional to the postings of the matching terms,
+// not to the size of the site.
+const BM25_K1 = 1.2;
+const BM25_B = 0.75;
+const PREFIX_WEIGHT = 0.5;
+const sortedTerms = new WeakMap();
+let averageLength = null;
+
+function termsWithPrefix(shard, prefix) {
+  let terms = sortedTerms.get(shard);
+  if (!terms) {
+    terms = Object.keys(shard).sort();
+    sortedTerms.set(shard, terms);
+  }
+  let lo = 0;
+  let hi = terms.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (terms[mid] < prefix) lo = mid + 1; else hi = mid;
+  }
+  const found = [];
+  for (let i = lo; i < terms.length && terms[i].startsWith(prefix); i++) {
+    found.push(terms[i]);
+  }
+  return found;
+}
+
+class Cancelled extends Error {}
+
+function checkCurrent(id) {
+  if (id !== latestId) throw new Cancelled();
+}
+
+async function rankPages(manifest, tokens, id) {
+  const shardKeys = Object.keys(manifest.terms);
+  const pageCount = manifest.pages.length;
+  const boosts = manifest.boosts;
+  if (averageLength === null) {
+    averageLength = manifest.lengths.reduce((sum, length) => sum + length, 0) / Math.max(1, pageCount) || 1;
+  }
+  let scores = null;
+  for (const token of tokens) {
+    const keys = shardKeys.filter(key => token.startsWith(key) || key.startsWith(token));
+    const shards = await Promise.all(keys.map(key => loadFile(manifest.terms[key])));
+    checkCurrent(id);
+    const tokenScores = new Map();
+    shards.forEach(shard => {
+      termsWithPrefix(shard, token).forEach(term => {
+        // Postings are flat [page id, title tf, body tf, ...] triples
+        const postings = shard[term];
+        const df = postings.length / 3;
+        const idf = Math.log(1 + (pageCount - df + 0.5) / (df + 0.5));
+        const weight = term === token ? 1 : PREFIX_WEIGHT;
+        for (let i = 0; i < postings.length; i += 3) {
+          const page = postings[i];
+          const tf = boosts.title * postings[i + 1] + boosts.body * postings[i + 2];
+          const norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * manifest.lengths[page] / averageLength);
+          const score = weight * idf * tf * (BM25_K1 + 1) / norm;
+          if (score > (tokenScores.get(page) || 0)) {
+            tokenScores.set(page, score);
+          }
+        }
+      });
+    });
+    if (scores === null) {
+      scores = tokenScores;
+    } else {
+      const both = new Map();
+      scores.forEach((score, page) => {
+        if (tokenScores.has(page)) both.set(page, score + tokenScores.get(page));
+      });
+      scores = both;
+    }
+    if (scores.size === 0) break;
+  }
+  return Array.from(scores || [])
+    .sort((a, b) => b[1] - a[1] || a[0] - b[0])
+    .map(entry => entry[0]);
+}
+
+// Page text for snippets, from the text shard covering each page
+async function pageTexts(manifest, pages) {
+  const texts = new Map();
+  const shardFor = (page) => {
+    let found = null;
+    manifest.text.forEach(entry => { if (entry[0] <= page) found = entry; });
+    return found;
+  };
+  await Promise.all(pages.map(async page => {
+    const entry = shardFor(page);
+    if (entry) {
+      const shard = await loadFile(entry[1]);
+      texts.set(page, shard[page - entry[0]] || '');
+    }
+  }));
+  return texts;
+}
+
+function escapeRegExp(string) {
+  return string.replace(/[.*+?^${}()|[\]\\]/g, '\\$&'); // $& means the whole matched string
+}
+
+function escapeHtml(string) {
+  return string.replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;').replace(/"/g, '&quot;');
+}
+
+function highlightText(text, regex) {
+  if (!text) return '';
+  let html = '';
+  let last = 0;
+  // regex captures (word boundary, matched token prefix)
+  text.replace(regex, (match, lead, word, offset) => {
+    const start = offset + lead.length;
+    html += escapeHtml(text.slice(last, start)) + '<mark>' + escapeHtml(word) + '</mark>';
+    last = start + word.length;
+    return match;
+  });
+  return html + escapeHtml(text.slice(last));
+}
+
+function makeSnippet(text, regex) {
+  regex.lastIndex = 0;
+  const match = regex.exec(text);
+  regex.lastIndex = 0;
+  if (!match) {
+    return text.substring(0, SNIPPET_LENGTH) + (text.length > SNIPPET_LENGTH ? '...' : '');
+  }
+  const queryIndex = match.index + match[1].length;
+  let start = Math.max(0, queryIndex - Math.floor((SNIPPET_LENGTH - match[2].length) / 2));
+  let end = Math.min(text.length, start + SNIPPET_LENGTH);
+
+  if (end - start < SNIPPET_LENGTH && start === 0) {
+    end = Math.min(text.length, SNIPPET_LENGTH);
+  }
+  if (end - start < SNIPPET_LENGTH && end === text.length) {
+    start = Math.max(0, text.length - SNIPPET_LENGTH);
+  }
+
+  let snippetText = text.substring(start, end);
+  if (start > 0) snippetText = '...' + snippetText;
+  if (end < text.length) snippetText = snippetText + '...';
+  return snippetText;
+}
+
+async function runQuery(id, query) {
+  const tokens = tokenize(query);
+  const manifest = await loadManifest();
+  checkCurrent(id);
+  const pages = (await rankPages(manifest, tokens, id)).slice(0, MAX_RESULTS);
+  const texts = await pageTexts(manifest, pages);
+  checkCurrent(id);
+
+  // Highlight tokens where they start a word, as the index matches them
+  const regex = new RegExp('(^|[^\\p{L}\\p{N}_])(' + tokens.map(escapeRegExp).join('|') + ')', 'giu');
+  return pages.map(page => {
+    const [title, url] = manifest.pages[page];
+    const text = texts.get(page);
+    return {
+      url,
+      titleHtml: highlightText(title, regex),
+      snippetHtml: text ? highlightText(makeSnippet(text, regex), regex) : '',
+    };
+  });
+}
+
+self.onmessage = (event) => {
+  const message = event.data;
+  if (message.type === 'init') {
+    siteRoot = message.root;
+  } else if (message.type === 'warm') {
+    loadManifest().catch(() => {});
+  } else if (message.type === 'cancel') {
+    latestId = Math.max(latestId, message.id);
+  } else if (message.type === 'query') {
+    latestId = message.id;
+    runQuery(message.id, message.query)
+      .then(results => self.postMessage({ id: message.id, results }))
+      .catch(error => {
+        if (!(error instanceof Cancelled)) {
+          self.postMessage({ id: message.id, error: String(error && error.message || error) });
+        }
+      });
+  }
+};
@@ -13,61 +13,136 @@ document.addEventListener('DOMContentLoaded', () => {
   const searchInput = document.getElementById('search-input');
   const resultsContainer = document.getElementById('search-results-container');
   const searchClearBtn = document.getElementById('search-clear-btn');
-  let searchIndex = [];
   let activeResultIndex = -1;
+  const SEARCH_DEBOUNCE_MS = 80;
 
-  if (resultsContainer && searchInput && searchInput.value.trim().length >= 2) {
-    resultsContainer.innerHTML = '<p>Loading search...</p>';
-    resultsContainer.style.display = 'block';
-  } else if (resultsContainer) {
+  if (resultsContainer) {
     resultsContainer.style.display = 'none';
   }
 
   // Fetch the index relative to the page: works on the canonical domain
   // and on any mirror/preview/local serve of the same build, where the
   // absolute configured base would be a cross-origin request.
-  const searchIndexPath = (window.PAGE_RELATIVE_ROOT
+  const siteRoot = window.PAGE_RELATIVE_ROOT
     ? window.PAGE_RELATIVE_ROOT
-    : (window.SITE_BASE_URL && window.SITE_BASE_URL !== '.' ? window.SITE_BASE_URL : '')) + '/search_index.json';
-  fetch(searchIndexPath)
-    .then(response => {
-      if (!response.ok) {
-        throw new Error('Network response was not ok for search_index.json');
-      }
-      return response.json();
-    })
-    .then(data => {
-      searchIndex = data;
-      if (searchInput.value.trim().length < 2 && resultsContainer) {
-        resultsContainer.style.display = 'none';
-        resultsContainer.innerHTML = '';
-      } else if (searchInput.value.trim().length >= 2 && resultsContainer && resultsContainer.innerHTML.includes("Loading search...")) {
-        searchInput.dispatchEvent(new Event('input', { bubbles: true }));
-      }
-    })
-    .catch(error => {
-      console.error('Error fetching or parsing search_index.json:', error);
-      if (resultsContainer) {
-        resultsContainer.innerHTML = '<p class="search-error">Error loading search data. Please try again later.</p>';
-        resultsContainer.style.display = 'block';
+    : (window.SITE_BASE_URL && window.SITE_BASE_URL !== '.' ? window.SITE_BASE_URL : '');
+
+  // Index loading and query evaluation run in static/js/search-worker.js,
+  // started the first time the search box is used; this thread only
+  // renders the result lists the worker sends back.
+  let worker = null;
+  let workerFailed = false;
+  const pending = new Map();
+
+  function getWorker() {
+    if (!worker && !workerFailed) {
+      try {
+        const root = new URL(siteRoot + '/', document.baseURI).href;
+        // The template passes the worker's published (fingerprinted) path
+        const workerUrl = window.SEARCH_WORKER_URL
+          ? new URL(window.SEARCH_WORKER_URL, document.baseURI).href
+          : root + 'static/js/search-worker.js';
+        worker = new Worker(workerUrl);
+        worker.postMessage({ type: 'init', root });
+        worker.onmessage = (event) => {
+          const handler = pending.get(event.data.id);
+          pending.delete(event.data.id);
+          if (handler) handler(event.data);
+        };
+        // A worker that failed to load or crashed is dropped, so the next
+        // query starts a fresh one instead of waiting on it forever
+        worker.onerror = (event) => {
+          event.preventDefault();
+          worker.terminate();
+          worker = null;
+          const failed = [...pending.values()];
+          pending.clear();
+          failed.forEach(handler => handler({ error: event.message || 'search worker failed' }));
+        };
+      } catch (error) {
+        console.error('Could not start the search worker:', error);
+        workerFailed = true;
       }
-    });
+    }
+    return worker;
+  }
 
   if (searchInput && resultsContainer) {
-    function escapeRegExp(string) {
-      return string.replace(/[.*+?^${}()|[\]\\]/g, '\\$&'); // $& means the whole matched string
+    function renderResults(results) {
+      resultsContainer.innerHTML = '';
+      resultsContainer.style.display = 'block';
+      if (results.length === 0) {
+        resultsContainer.innerHTML = '<p>No results found. Try different keywords or check your spelling.</p>';
+        return;
+      }
+      const ul = document.createElement('ul');
+      ul.style.listStyleType = 'none';
+      ul.style.padding = '0';
+      ul.style.margin = '0';
+      results.forEach(item => {
+        const li = document.createElement('li');
+        const a = document.createElement('a');
+        // Configured-base sites store absolute URLs in the index; use
+        // them as-is. Zero-config sites store relative URLs — prefix the
+        // page's base so links resolve from nested pages too.
+        const isAbsoluteUrl = /^(?:https?:)?\/\//.test(item.url) || item.url.startsWith('/');
+        const siteBase = (window.SITE_BASE_URL && window.SITE_BASE_URL !== '.') ? window.SITE_BASE_URL + '/' : '';
+        a.href = isAbsoluteUrl ? item.url : siteBase + item.url;
+
+        // The worker escapes page text before adding <mark> highlights
+        const titleElement = document.createElement('div');
+        titleElement.className = 'search-result-title';
+        titleElement.innerHTML = item.titleHtml;
+        a.appendChild(titleElement);
+        li.appendChild(a);
+
+        if (item.snippetHtml) {
+          const snippetElement = document.createElement('p');
+          snippetElement.className = 'search-result-snippet';
+          snippetElement.innerHTML = item.snippetHtml;
+          li.appendChild(snippetElement);
+        }
+        ul.appendChild(li);
+      });
+      resultsContainer.appendChild(ul);
     }
 
-    function highlightText(text, query) {
-      if (!query || !text) return text;
-      const escapedQuery = escapeRegExp(query);
-      const regex = new RegExp(escapedQuery, 'gi');
-      return text.replace(regex, (match) => '<mark>' + match + '</mark>');
+    function showError(error) {
+      console.error('Error fetching or parsing the search index:', error);
+      resultsContainer.innerHTML = '<p class="search-error">Error loading search data. Please try again later.</p>';
+      resultsContainer.style.display = 'block';
+    }
+
+    // Only the latest query may render; the worker abandons older ones
+    let querySeq = 0;
+    let debounceTimer = null;
+
+    function runQuery(seq, query) {
+      const searchWorker = getWorker();
+      if (!searchWorker) {
+        showError('search worker unavailable');
+        return;
+      }
+      pending.set(seq, (response) => {
+        if (seq !== querySeq) return;
+        if (response.error) {
+          showError(response.error);
+        } else {
+          renderResults(response.results);
+        }
+      });
+      searchWorker.postMessage({ type: 'query', id: seq, query });
+    }
+
+    function cancelQueries() {
+      clearTimeout(debounceTimer);
+      pending.clear();
+      if (worker) worker.postMessage({ type: 'cancel', id: querySeq });
     }
 
     searchInput.addEventListener('input', () => {
       const originalQuery = searchInput.value.trim();
-      const lowerCaseQuery = originalQuery.toLowerCase();
+      const seq = ++querySeq;
 
       if (searchClearBtn) {
         if (originalQuery.length > 0) {
@@ -78,85 +153,29 @@ document.addEventListener('DOMContentLoaded', () => {
       }
 
       activeResultIndex = -1;
-      resultsContainer.innerHTML = '';
 
-      if (lowerCaseQuery.length < 2) {
+      if (originalQuery.length < 2 || !/[\p{L}\p{N}_]/u.test(originalQuery)) {
+        cancelQueries();
+        resultsContainer.innerHTML = '';
         resultsContainer.style.display = 'none';
         return;
       }
 
-      const results = searchIndex.filter(item => {
-        const titleMatch = item.title && item.title.toLowerCase().includes(lowerCaseQuery);
-        const textMatch = item.text && item.text.toLowerCase().includes(lowerCaseQuery);
-        return titleMatch || textMatch;
-      });
-
-      resultsContainer.style.display = 'block';
-
-      if (results.length > 0) {
-        const ul = document.createElement('ul');
-        ul.style.listStyleType = 'none';
-        ul.style.padding = '0';
-        ul.style.margin = '0';
-        results.forEach(item => {
-          const li = document.createElement('li');
-          const a = document.createElement('a');
-          // Configured-base sites store absolute URLs in the index; use
-          // them as-is. Zero-config sites store relative URLs — prefix the
-          // page's base so links resolve from nested pages too.
-          const isAbsoluteUrl = /^(?:https?:)?\/\//.test(item.url) || item.url.startsWith('/');
-          const siteBase = (window.SITE_BASE_URL && window.SITE_BASE_URL !== '.') ? window.SITE_BASE_URL + '/' : '';
-          a.href = isAbsoluteUrl ? item.url : siteBase + item.url;
-
-          const titleElement = document.createElement('div');
-          titleElement.className = 'search-result-title';
-          titleElement.innerHTML = highlightText(item.title, originalQuery);
-          a.appendChild(titleElement);
-          li.appendChild(a);
-
-          if (item.text) {
-            let snippetText = '';
-            const queryIndex = item.text.toLowerCase().indexOf(lowerCaseQuery);
-            const snippetLength = 150;
-
-            if (queryIndex !== -1) {
-              const queryActualLength = originalQuery.length;
-              let start = Math.max(0, queryIndex - Math.floor((snippetLength - queryActualLength) / 2));
-              let end = Math.min(item.text.length, start + snippetLength);
-
-              if (end - start < snippetLength && start === 0) {
-                end = Math.min(item.text.length, snippetLength);
-              }
-              if (end - start < snippetLength && end === item.text.length) {
-                start = Math.max(0, item.text.length - snippetLength);
-              }
-
-              snippetText = item.text.substring(start, end);
-              if (start > 0) snippetText = '...' + snippetText;
-              if (end < item.text.length) snippetText = snippetText + '...';
-
-            } else {
-              snippetText = item.text.substring(0, snippetLength) + (item.text.length > snippetLength ? '...' : '');
-            }
-
-            if (snippetText) {
-              const snippetElement = document.createElement('p');
-              snippetElement.className = 'search-result-snippet';
-              snippetElement.innerHTML = highlightText(snippetText, originalQuery);
-              li.appendChild(snippetElement);
-            }
-          }
-          ul.appendChild(li);
-        });
-        resultsContainer.appendChild(ul);
-      } else {
-        resultsContainer.innerHTML = '<p>No results found. Try different keywords or check your spelling.</p>';
+      if (!resultsContainer.firstChild) {
+        resultsContainer.innerHTML = '<p>Loading search...</p>';
+        resultsContainer.style.display = 'block';
       }
+
+      // Debounce: typing a word runs one lookup, not one per keystroke
+      clearTimeout(debounceTimer);
+      debounceTimer = setTimeout(() => runQuery(seq, originalQuery), SEARCH_DEBOUNCE_MS);
     });
 
     if (searchClearBtn) {
       searchClearBtn.addEventListener('click', () => {
         searchInput.value = '';
+        querySeq++;
+        cancelQueries();
         searchClearBtn.style.display = 'none';
         resultsContainer.innerHTML = '';
         resultsContainer.style.display = 'none';
@@ -222,6 +241,8 @@ document.addEventListener('DOMContentLoaded', () => {
 
     searchInput.addEventListener('focus', () => {
       clearTimeout(hideTimeout);
+      const searchWorker = getWorker();
+      if (searchWorker) searchWorker.postMessage({ type: 'warm' });
       if (searchInput.value.trim().length >= 2 && resultsContainer.firstChild && resultsContainer.firstChild.innerHTML !== '' && resultsContainer.firstChild.innerHTML !== '<p>No results found.</p>') {
         resultsContainer.style.display = 'block';
         const resultItems = resultsContainer.querySelectorAll('ul li');